@@ -1,11 +1,22 @@
 import os
-import requests
-import pandas as pd
+import sys
+import argparse
 from tqdm import tqdm
 import time
+import random
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from datetime import date, datetime, timezone
 from dotenv import load_dotenv
 
+# Shared modules live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_client import configure_client, get_client, REQUEST_ERRORS
+from rate_limit import TokenBucket
+from crunchbase_sink import open_sink, SINK_FORMATS
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -26,6 +37,7 @@ else:
 
 # API Configuration
 BASE_URL = 'https://api.crunchbase.com/v4/data/entities/organizations'
+SEARCH_URL = 'https://api.crunchbase.com/v4/data/searches/organizations'
 HEADERS = {
     'X-cb-user-key': API_KEY,
     'Content-Type': 'application/json',
@@ -35,38 +47,217 @@ HEADERS = {
 # Pagination Settings
 PER_PAGE = 100  # Maximum allowed by API
 TOTAL_PAGES = 10000  # Set a high number; loop will stop when no more data
-RATE_LIMIT_DELAY = 0.3  # 200 calls per minute => 0.3 seconds per call
+CALLS_PER_MINUTE = 200  # API quota, shared by all workers through one token bucket
+CONCURRENCY = 8  # Pages in flight at once, so latency doesn't leave quota unused
 
-# Initialize Data Storage
-companies_data = []
+# Incremental Sync Settings
+SEARCH_LIMIT = 1000  # Maximum entities per search call
 
-def fetch_companies(page):
+# Search field id for each organization key read by extract_company_data. --sync
+# requests only these fields instead of whole organization pages.
+SEARCH_FIELDS = {
+    'stage': 'funding_stage',
+    'short_description': 'short_description',
+    'cb_rank': 'rank_org',
+    'investment_stage': 'investor_stage',
+    'portfolio_count': 'num_portfolio_organizations',
+    'investments_count': 'num_investments',
+    'lead_investments_count': 'num_lead_investments',
+    'accelerator_program_type': 'accelerator_program_type',
+    'accelerator_application_deadline': 'accelerator_application_deadline',
+    'investor_type': 'investor_type',
+    'alumni_count': 'num_alumni',
+    'number_of_employees': 'num_employees_enum',
+    'last_funding_date': 'last_funding_at',
+    'last_funding_amount': 'last_funding_total',
+    'last_funding_type': 'last_funding_type',
+    'last_equity_funding_type': 'last_equity_funding_type',
+    'last_equity_funding_amount': 'last_equity_funding_total',
+    'total_funding_amount': 'funding_total',
+    'estimated_revenue_range': 'revenue_range',
+    'operating_status': 'operating_status',
+    'founded_date': 'founded_on',
+    'company_type': 'company_type',
+    'homepage_url': 'website_url',
+    'linkedin_url': 'linkedin',
+    'contact_email': 'contact_email',
+    'phone_number': 'phone_number',
+    'full_description': 'description',
+}
+# Identifier fields turned into the nested shapes extract_company_data reads
+IDENTIFIER_FIELDS = ['identifier', 'categories', 'location_identifiers', 'founder_identifiers', 'investor_identifiers']
+SEARCH_FIELD_IDS = IDENTIFIER_FIELDS + list(SEARCH_FIELDS.values())
+
+# Retry Settings
+MAX_RETRIES = 6
+BACKOFF_BASE = 1  # Seconds, doubled on every retry
+BACKOFF_MAX = 60
+
+# Connection Settings (all calls go to one host, so they share one keep-alive pool)
+POOL_SIZE = CONCURRENCY
+USE_HTTP2 = os.getenv('CRUNCHBASE_HTTP2') == '1'  # Needs httpx[http2]
+
+# Output Settings
+DEFAULT_OUTPUT = {
+    'csv': 'crunchbase_companies_selected_columns.csv',
+    'parquet': 'crunchbase_companies_parquet',
+    'sqlite': 'crunchbase_companies.db',
+}
+DATE_COLUMNS = ['Founded Date', 'Last Funding Date']
+
+rate_limiter = TokenBucket(CALLS_PER_MINUTE / 60)
+
+def retry_after_seconds(response):
     """
-    Fetch companies data from a specific page.
+    Return the wait requested by a Retry-After header (seconds or HTTP date), or None.
     """
-    params = {
-        'page': page,
-        'limit': PER_PAGE
-        # Add other filters or parameters as needed
-    }
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
     try:
-        response = requests.get(BASE_URL, headers=HEADERS, params=params)
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_seconds(attempt):
+    # Bounded exponential backoff with jitter so workers don't retry in lockstep
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1)
+
+def request_with_retries(method, url, description, **kwargs):
+    """
+    Send one API call and return the decoded JSON, or None on failure.
+    Waits for the shared rate limiter before every call and retries 429s, 5xx
+    responses and connection errors with backoff, up to MAX_RETRIES times.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        rate_limiter.acquire()
+        try:
+            response = get_client().request(method, url, headers=HEADERS, **kwargs)
+        except REQUEST_ERRORS as e:
+            wait = backoff_seconds(attempt)
+            logging.warning(f"Request exception on {description}: {e}. Retrying in {wait:.1f} seconds.")
+            time.sleep(wait)
+            continue
+
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 429:
-            # Rate limit exceeded
-            logging.warning(f"Rate limit exceeded on page {page}. Waiting for 60 seconds.")
-            time.sleep(60)  # Wait before retrying
-            return fetch_companies(page)
+            # Rate limit exceeded: hold back every worker, not just this one
+            wait = retry_after_seconds(response)
+            if wait is None:
+                wait = backoff_seconds(attempt)
+            logging.warning(f"Rate limit exceeded on {description}. Waiting for {wait:.1f} seconds.")
+            rate_limiter.pause(wait)
         elif response.status_code == 401:
             logging.error("Unauthorized access. Check your API key.")
             exit(1)
+        elif response.status_code >= 500:
+            wait = backoff_seconds(attempt)
+            logging.warning(f"Server error {response.status_code} on {description}. Retrying in {wait:.1f} seconds.")
+            time.sleep(wait)
         else:
-            logging.error(f"Failed to fetch page {page}. Status Code: {response.status_code}")
+            logging.error(f"Failed to fetch {description}. Status Code: {response.status_code}")
             return None
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Request exception on page {page}: {e}")
-        return None
+
+    logging.error(f"Giving up on {description} after {MAX_RETRIES} retries.")
+    return None
+
+def fetch_companies(page):
+    """
+    Fetch companies data from a specific page.
+    """
+    params = {
+        'page': page,
+        'limit': PER_PAGE
+        # Add other filters or parameters as needed
+    }
+    return request_with_retries('GET', BASE_URL, f"page {page}", params=params)
+
+def fetch_pages(first_page=1, last_page=TOTAL_PAGES, concurrency=CONCURRENCY):
+    """
+    Yield (page, data) in page order while up to 'concurrency' pages are fetched
+    at once. The caller stops the iteration at the first empty or failed page;
+    pages already in flight past that point are discarded.
+    """
+    pages = iter(range(first_page, last_page + 1))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight = deque()
+        try:
+            for page in pages:
+                in_flight.append((page, executor.submit(fetch_companies, page)))
+                if len(in_flight) >= concurrency:
+                    break
+            while in_flight:
+                page, future = in_flight.popleft()
+                yield page, future.result()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    in_flight.append((next_page, executor.submit(fetch_companies, next_page)))
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+def now_iso():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def search_companies(updated_since=None, after_id=None):
+    """
+    Fetch one page of organizations from the search endpoint, projected to
+    SEARCH_FIELD_IDS and limited to those updated since 'updated_since'.
+    """
+    body = {
+        'field_ids': SEARCH_FIELD_IDS,
+        'order': [{'field_id': 'uuid', 'sort': 'asc'}],
+        'limit': SEARCH_LIMIT,
+    }
+    if updated_since:
+        body['query'] = [{
+            'type': 'predicate', 'field_id': 'updated_at', 'operator_id': 'gte', 'values': [updated_since]
+        }]
+    if after_id:
+        body['after_id'] = after_id
+    return request_with_retries('POST', SEARCH_URL, f"search after {after_id or 'start'}", json=body)
+
+def identifier_value(identifier):
+    return (identifier or {}).get('value')
+
+def identifier_values(identifiers):
+    # Identifiers without a value are dropped, so the lists can be joined
+    values = (identifier_value(identifier) for identifier in identifiers or [])
+    return [value for value in values if value is not None]
+
+def organization_from_search(entity):
+    """
+    Turn a search entity ({'uuid', 'properties'}) into the {'organization': {...}}
+    item shape that extract_company_data reads.
+    """
+    properties = entity.get('properties', {})
+    organization = {}
+    for key, field_id in SEARCH_FIELDS.items():
+        value = properties.get(field_id)
+        # Dates and links come wrapped as {'value': ...}; money keeps its currency
+        if isinstance(value, dict) and 'value' in value and 'currency' not in value:
+            value = value['value']
+        organization[key] = value
+
+    organization['name'] = identifier_value(properties.get('identifier'))
+    organization['categories'] = identifier_values(properties.get('categories'))
+    locations = {}
+    for location in properties.get('location_identifiers') or []:
+        if identifier_value(location) is not None:
+            locations.setdefault(location.get('location_type'), identifier_value(location))
+    organization['headquarters'] = {'region': locations.get('region'), 'country': locations.get('country')}
+    organization['founders'] = {
+        'items': [{'founder': {'name': name}} for name in identifier_values(properties.get('founder_identifiers'))]
+    }
+    organization['investors'] = {
+        'items': [{'investor': {'name': name}} for name in identifier_values(properties.get('investor_identifiers'))]
+    }
+    return {'organization': organization}
 
 def extract_company_data(item):
     """
@@ -99,8 +290,9 @@ def extract_company_data(item):
     company = {
         'Organization Name': organization.get('name'),
         'Stage': organization.get('stage'),
-        'Industries': ', '.join(organization.get('categories', [])),
+        'Industries': ', '.join(category for category in organization.get('categories') or [] if category),
         'Headquarters Location': organization.get('headquarters', {}).get('region'),
+        'Headquarters Country': organization.get('headquarters', {}).get('country'),
         'Description': organization.get('short_description'),
         'CB Rank (Company)': organization.get('cb_rank'),
         'Investment Stage': organization.get('investment_stage'),
@@ -134,41 +326,136 @@ def extract_company_data(item):
     
     return company
 
-def main():
+def normalize_date(value):
+    # ISO date string, or None for values that aren't a date (like pd.to_datetime(errors='coerce'))
+    try:
+        return date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        return None
+
+def prepare_row(company):
+    for column in DATE_COLUMNS:
+        company[column] = normalize_date(company[column])
+    return company
+
+def sync_all_pages(sink, resume):
     """
-    Main function to fetch and store company data.
+    Fetch every organization page by page, keeping the first organization with
+    each name. Returns the number of organizations written.
     """
-    global companies_data
-    for page in tqdm(range(1, TOTAL_PAGES + 1), desc="Fetching Companies"):
-        data = fetch_companies(page)
+    first_page = sink.state.get('page', 0) + 1 if resume else 1
+    if first_page > 1:
+        print(f"Resuming after page {first_page - 1}.")
+    # Organizations changed after this time are picked up by the next --sync
+    started = sink.state.get('started') if resume else None
+    started = started or now_iso()
+
+    written = 0
+    page = first_page - 1
+    completed = False
+    for page, data in tqdm(fetch_pages(first_page), desc="Fetching Companies"):
         if data and 'data' in data and 'items' in data['data']:
             items = data['data']['items']
             if not items:
                 logging.info(f"No more data found at page {page}. Stopping.")
+                completed = True
                 break
+            rows = []
             for item in items:
                 company = extract_company_data(item)
-                companies_data.append(company)
+                # Keep the first organization with each name
+                if sink.state.is_new(company['Organization Name'] or ''):
+                    rows.append(prepare_row(company))
+            sink.write(rows)
+            sink.commit(page=page, started=started)
+            written += len(rows)
         else:
             logging.warning(f"Unexpected data format or failed to retrieve data on page {page}. Stopping.")
+            page -= 1
             break
-        
-        # Respect Rate Limits
-        time.sleep(RATE_LIMIT_DELAY)  # 0.3 seconds delay to stay within 200 calls/minute
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(companies_data)
-    
-    # Data Cleaning
-    df.drop_duplicates(subset=['Organization Name'], inplace=True)
-    df['Founded Date'] = pd.to_datetime(df['Founded Date'], errors='coerce')
-    df['Last Funding Date'] = pd.to_datetime(df['Last Funding Date'], errors='coerce')
-    
-    # Save to CSV
-    output_file = 'crunchbase_companies_selected_columns.csv'
-    df.to_csv(output_file, index=False)
-    logging.info(f"Data retrieval complete. Saved to {output_file}.")
-    print(f"Data retrieval complete. Saved to {output_file}.")
+    # Flush buffered rows; a failed page is left for --resume
+    if completed:
+        sink.commit(final=True, page=page, started=started, updated_since=started)
+    else:
+        sink.commit(final=True, page=page, started=started)
+    return written
+
+def sync_updated(sink):
+    """
+    Fetch only the organizations updated since the stored 'updated_since' cursor,
+    requesting just the fields extract_company_data maps. An interrupted sync
+    continues from its last committed search page. Returns the number written.
+    """
+    updated_since = sink.state.get('updated_since')
+    after_id = sink.state.get('after_id')
+    # A sync in progress keeps its start time so nothing changed meanwhile is missed
+    started = sink.state.get('sync_started') if after_id else None
+    started = started or now_iso()
+    print(f"Syncing organizations updated since {updated_since or 'the beginning'}.")
+
+    written = 0
+    with tqdm(desc="Syncing Companies") as progress:
+        while True:
+            data = search_companies(updated_since, after_id)
+            if data is None or 'entities' not in data:
+                logging.warning(f"Search failed after {after_id or 'start'}. Stopping; rerun --sync to continue.")
+                sink.commit(final=True, after_id=after_id, sync_started=started)
+                return written
+            entities = data['entities']
+            if not entities:
+                break
+            rows = []
+            for entity in entities:
+                company = extract_company_data(organization_from_search(entity))
+                sink.state.remember(company['Organization Name'] or '')
+                rows.append(prepare_row(company))
+            sink.write(rows, replace=True)
+            after_id = entities[-1]['uuid']
+            sink.commit(after_id=after_id, sync_started=started)
+            written += len(rows)
+            progress.update(len(rows))
+            if len(entities) < SEARCH_LIMIT:
+                break
+
+    # The sync is complete: the next one starts from this run's start time
+    sink.commit(final=True, after_id=None, sync_started=None, updated_since=started)
+    return written
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch organizations from the Crunchbase API")
+    parser.add_argument("--format", choices=SINK_FORMATS, default='csv',
+                        help="Output written page by page (default: csv)")
+    parser.add_argument("--output", help="Output path (default: depends on --format)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue after the last page committed to the output")
+    parser.add_argument("--sync", action="store_true",
+                        help="Only fetch organizations updated since the last completed run, "
+                             "requesting just the mapped fields")
+    return parser.parse_args()
+
+def main():
+    """
+    Main function to fetch and store company data.
+    """
+    args = parse_args()
+    output = args.output or DEFAULT_OUTPUT[args.format]
+    columns = list(extract_company_data({}).keys())
+    # A sync updates the existing output instead of starting over
+    sink = open_sink(args.format, output, columns, args.resume or args.sync)
+
+    client = configure_client(POOL_SIZE, USE_HTTP2)
+    try:
+        if args.sync:
+            written = sync_updated(sink)
+        else:
+            written = sync_all_pages(sink, args.resume)
+    finally:
+        sink.close()
+        logging.info(f"Connections: {client.summary()}")
+        client.close()
+
+    logging.info(f"Data retrieval complete. {written} organizations saved to {output}.")
+    print(f"Data retrieval complete. {written} organizations saved to {output}.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,230 @@
+import csv
+import glob
+import json
+import os
+import sqlite3
+
+# Append-friendly sinks for crunchbase_api_scraper.
+#
+# Each page of organizations is written as soon as it arrives instead of being
+# collected in one list. De-duplication on the organization name goes through a
+# persistent key index (SQLite), so memory stays flat however many pages are
+# fetched. After the rows of a page are on disk, the new keys, the last page and
+# the sink's position are committed together. A run that fails partway can be
+# resumed from the last committed page, and anything written after that commit
+# is rolled back first, so rows are never duplicated or lost.
+#
+# Incremental syncs write changed organizations again: SQLite replaces the old
+# row, CSV and Parquet append it (the last row per name is the current one).
+
+SINK_FORMATS = ('csv', 'parquet', 'sqlite')
+
+STATE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS seen_keys (key TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value TEXT);
+'''
+
+def cell_value(value):
+    # Nested API values (money, locations, ...) are stored as JSON text
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+class SyncState:
+    """
+    Persistent key index plus named values (last page, sink position, ...),
+    kept in a SQLite database.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.db.executescript(STATE_SCHEMA)
+        self.pending_keys = set()
+
+    def get(self, name, default=None):
+        row = self.db.execute('SELECT value FROM sync_state WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, name, value):
+        self.db.execute(
+            'INSERT INTO sync_state (name, value) VALUES (?, ?) '
+            'ON CONFLICT (name) DO UPDATE SET value = excluded.value',
+            (name, json.dumps(value))
+        )
+
+    def is_new(self, key):
+        """
+        Return True (and remember the key until the next commit) if key hasn't been written yet.
+        """
+        if key in self.pending_keys:
+            return False
+        if self.db.execute('SELECT 1 FROM seen_keys WHERE key = ?', (key,)).fetchone():
+            return False
+        self.pending_keys.add(key)
+        return True
+
+    def remember(self, key):
+        # Record a key without filtering on it (incremental syncs rewrite changed rows)
+        self.pending_keys.add(key)
+
+    def commit(self, **values):
+        with self.db:
+            self.db.executemany('INSERT OR IGNORE INTO seen_keys (key) VALUES (?)', [(key,) for key in self.pending_keys])
+            for name, value in values.items():
+                self.set(name, value)
+        self.pending_keys = set()
+
+    def reset(self):
+        with self.db:
+            self.db.execute('DELETE FROM seen_keys')
+            self.db.execute('DELETE FROM sync_state')
+        self.pending_keys = set()
+
+class CsvSink:
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self.state = SyncState(sqlite3.connect(path + '.state.sqlite3'))
+        self.file = None
+
+    def open(self, resume=False):
+        position = self.state.get('position') if resume and os.path.exists(self.path) else None
+        fieldnames = self.columns
+        if position is None:
+            self.state.reset()
+            self.file = open(self.path, 'w', encoding='utf-8', newline='')
+        else:
+            self.file = open(self.path, 'r+', encoding='utf-8', newline='')
+            # Keep the header of the file being resumed, even if it has fewer columns
+            fieldnames = next(csv.reader(self.file), None) or self.columns
+            # Drop rows written after the last commit
+            self.file.truncate(position)
+            self.file.seek(position)
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, lineterminator='\n', extrasaction='ignore')
+        if position is None:
+            self.writer.writeheader()
+
+    def write(self, rows, replace=False):
+        # Updated organizations are appended; the last row per name is the current one
+        self.writer.writerows({column: cell_value(row.get(column)) for column in self.writer.fieldnames} for row in rows)
+
+    def commit(self, final=False, **values):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.state.commit(position=self.file.tell(), **values)
+
+    def close(self):
+        self.file.close()
+        self.state.db.close()
+
+class ParquetSink:
+    """
+    Writes a directory of Parquet files, one per commit that has rows. Each file
+    is complete when written, so a crash never leaves a half-written footer.
+    """
+
+    def __init__(self, path, columns, rows_per_file=10000):
+        # Imported here so CSV and SQLite output don't need pyarrow installed
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.columns = columns
+        self.rows_per_file = rows_per_file
+        self.schema = pa.schema([(column, pa.string()) for column in columns])
+        os.makedirs(path, exist_ok=True)
+        # Files starting with '_' are skipped by pyarrow datasets
+        self.state = SyncState(sqlite3.connect(os.path.join(path, '_sync_state.sqlite3')))
+        self.buffer = []
+        self.files = 0
+
+    def _file_path(self, index):
+        return os.path.join(self.path, f'part-{index:06d}.parquet')
+
+    def open(self, resume=False):
+        self.files = self.state.get('position') if resume else None
+        if self.files is None:
+            self.state.reset()
+            self.files = 0
+        # Drop files written after the last commit (or all of them on a fresh run)
+        for path in glob.glob(os.path.join(self.path, 'part-*.parquet')):
+            if int(os.path.basename(path)[5:11]) >= self.files:
+                os.remove(path)
+
+    def write(self, rows, replace=False):
+        # Updated organizations are appended; the last row per name is the current one
+        for row in rows:
+            self.buffer.append({
+                column: None if row.get(column) is None else str(cell_value(row.get(column)))
+                for column in self.columns
+            })
+
+    def commit(self, final=False, **values):
+        # Pages are buffered into files of about rows_per_file rows; the cursor
+        # values only move when a file is written, so a resume refetches the buffer
+        if len(self.buffer) < self.rows_per_file and not final:
+            return
+        if self.buffer:
+            self.pq.write_table(self.pa.Table.from_pylist(self.buffer, schema=self.schema),
+                                self._file_path(self.files), compression='zstd')
+            self.files += 1
+            self.buffer = []
+        self.state.commit(position=self.files, **values)
+
+    def close(self):
+        self.state.db.close()
+
+class SqliteSink:
+    """
+    One 'organizations' table. Rows, keys and sync state share the database,
+    so each page is committed in a single transaction.
+    """
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode = WAL')
+        # Column names are the CSV headers, e.g. "CB Rank (Company)", so they are quoted
+        column_list = ', '.join('"' + column + '"' for column in columns)
+        self.db.execute(f'CREATE TABLE IF NOT EXISTS organizations ({column_list})')
+        # Databases from older versions get the columns added since
+        existing = {row[1] for row in self.db.execute('PRAGMA table_info(organizations)')}
+        for column in columns:
+            if column not in existing:
+                self.db.execute(f'ALTER TABLE organizations ADD COLUMN "{column}"')
+        self.db.execute(f'CREATE INDEX IF NOT EXISTS idx_organizations_key ON organizations ("{columns[0]}")')
+        self.insert = f"INSERT INTO organizations ({column_list}) VALUES ({', '.join('?' for _ in columns)})"
+        self.state = SyncState(self.db)
+
+    def open(self, resume=False):
+        if not resume or self.state.get('position') is None:
+            self.state.reset()
+            with self.db:
+                self.db.execute('DELETE FROM organizations')
+
+    def write(self, rows, replace=False):
+        # Uncommitted until commit(), together with the keys and cursor
+        if replace:
+            self.db.executemany(f'DELETE FROM organizations WHERE "{self.columns[0]}" = ?',
+                                [(row.get(self.columns[0]),) for row in rows])
+        self.db.executemany(self.insert, [[cell_value(row.get(column)) for column in self.columns] for row in rows])
+
+    def commit(self, final=False, **values):
+        self.state.commit(position=0, **values)
+
+    def close(self):
+        self.db.close()
+
+def open_sink(sink_format, path, columns, resume=False):
+    if sink_format == 'csv':
+        sink = CsvSink(path, columns)
+    elif sink_format == 'parquet':
+        sink = ParquetSink(path, columns)
+    elif sink_format == 'sqlite':
+        sink = SqliteSink(path, columns)
+    else:
+        raise ValueError(f"Unknown sink format: {sink_format}")
+    sink.open(resume)
+    return sink
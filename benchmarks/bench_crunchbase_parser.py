@@ -0,0 +1,123 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+
+# Allow running as 'python benchmarks/bench_crunchbase_parser.py' from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crunchbase_parser import parse_profile, empty_profile
+
+# The bundled profiles are synthetic: hand-built pages with the markup and class names
+# that cb.py and crunchbase_parser.py look for, not recordings of crunchbase.com.
+# Pass saved pages as arguments to benchmark real profiles.
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'crunchbase')
+
+def safe_find(soup, tag, **kwargs):
+    element = soup.find(tag, **kwargs)
+    return element.get_text(strip=True) if element else ''
+
+# The original approach from cb.scrape_crunchbase: one full-tree search per field
+def parse_profile_soup(page_source):
+    data = empty_profile()
+    soup = BeautifulSoup(page_source, 'html.parser')
+
+    data['Name'] = safe_find(soup, 'h1', class_='profile-name')
+    data['Description'] = safe_find(soup, 'span', class_='component--field-formatter field-type-text_long ng-star-inserted')
+    data['Location'] = safe_find(soup, 'span', class_='component--field-formatter field-type-identifier-multi')
+    funding_tag = soup.find('a', class_='cb-link component--field-formatter field-type-money ng-star-inserted')
+    if funding_tag:
+        data['Funding'] = funding_tag.get_text(strip=True)
+
+    section2 = soup.find('div', class_='layout-wrap layout-row')
+    if section2:
+        indus_tag = section2.find('identifier-multi-formatter', class_='ng-star-inserted')
+        if indus_tag:
+            data['Industry'] = indus_tag.get_text(strip=True)
+        date_tag = section2.find('span', class_='component--field-formatter field-type-date_precision ng-star-inserted')
+        if date_tag:
+            data['Founding Date'] = date_tag.get_text(strip=True)
+        stage_tags = section2.find_all('span', class_='component--field-formatter field-type-enum ng-star-inserted')
+        if len(stage_tags) > 1:
+            data['Stage'] = stage_tags[1].get('title', '').strip()
+
+    website_tag = soup.find('a', class_='component--field-formatter field-type-url ng-star-inserted')
+    if website_tag:
+        data['Website'] = website_tag.get('href', '').strip()
+
+    for label, value_class in [
+        ('Number of Employees', 'component--field-formatter field-type-enum ng-star-inserted'),
+        ('Headquarters Address', 'component--field-formatter field-type-address ng-star-inserted'),
+        ('Revenue', 'component--field-formatter field-type-money ng-star-inserted'),
+        ('Last Funding Date', 'component--field-formatter field-type-date ng-star-inserted'),
+        ('Total Funding Amount', 'component--field-formatter field-type-money ng-star-inserted'),
+        ('Company Type', 'component--field-formatter field-type-enum ng-star-inserted'),
+        ('Stock Exchange Listing', 'component--field-formatter field-type-enum ng-star-inserted'),
+    ]:
+        label_tag = soup.find('span', string=label)
+        if label_tag:
+            value_tag = label_tag.find_next('span', class_=value_class)
+            if value_tag:
+                data[label] = value_tag.get_text(strip=True)
+
+    for section_id, field in [
+        ('founders', 'Founders'), ('executives', 'Key Executives'), ('investors', 'Investors'),
+        ('acquisitions', 'Acquisitions'), ('products', 'Products'), ('competitors', 'Competitors'),
+    ]:
+        section = soup.find('section', id=section_id)
+        if section:
+            data[field] = ', '.join(link.get_text(strip=True) for link in section.find_all('a', class_='cb-link'))
+
+    social_media_section = soup.find('div', class_='social-media-links')
+    if social_media_section:
+        social_links = social_media_section.find_all('a', class_='social-link')
+        data['Social Media Profiles'] = ', '.join(link.get('href', '').strip() for link in social_links)
+
+    return data
+
+def time_parser(parser, pages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            parser(page)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Crunchbase profile parser against profile pages")
+    parser.add_argument("pages", nargs="*", help="Saved HTML pages (default: the synthetic pages in benchmarks/fixtures/crunchbase)")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over the page set (default: 5)")
+    args = parser.parse_args()
+
+    paths = args.pages or sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+    if not paths:
+        print("No pages to benchmark.")
+        return
+
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+
+    # Both parsers must return the same fields before timing means anything
+    for path, page in zip(paths, pages):
+        expected, actual = parse_profile_soup(page), parse_profile(page)
+        if expected != actual:
+            print(f"Mismatch between parsers on {path}:")
+            for field in expected:
+                if expected[field] != actual[field]:
+                    print(f"  {field}: {expected[field]!r} != {actual[field]!r}")
+            sys.exit(1)
+
+    total = len(pages) * args.rounds
+    soup_time = time_parser(parse_profile_soup, pages, args.rounds)
+    index_time = time_parser(parse_profile, pages, args.rounds)
+
+    print(f"{len(pages)} pages x {args.rounds} rounds")
+    print(f"BeautifulSoup lookups: {soup_time / total * 1000:8.3f} ms/page")
+    print(f"parse_profile (lxml):  {index_time / total * 1000:8.3f} ms/page")
+    print(f"Speedup: {soup_time / index_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
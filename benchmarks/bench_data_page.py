@@ -0,0 +1,64 @@
+import argparse
+import glob
+import html
+import json
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+
+# Allow running as 'python benchmarks/bench_data_page.py' from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_page import extract_data_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'yc_pages')
+
+# The original approach: full html.parser tree, then find the data-page div
+def extract_data_page_full_parse(html_content):
+    soup = BeautifulSoup(html_content, "html.parser")
+    data_page_div = soup.find('div', attrs={'data-page': True})
+    if not data_page_div:
+        return None
+    return json.loads(html.unescape(data_page_div['data-page']))
+
+def time_extractor(extractor, pages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            extractor(page)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data-page extraction against saved YC pages")
+    parser.add_argument("pages", nargs="*", help="Saved HTML pages (default: the synthetic pages in benchmarks/fixtures/yc_pages)")
+    parser.add_argument("--rounds", type=int, default=20, help="Passes over the page set (default: 20)")
+    args = parser.parse_args()
+
+    paths = args.pages or sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+    if not paths:
+        print("No pages to benchmark.")
+        return
+
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+
+    # Both extractors must return the same dicts before timing means anything
+    for path, page in zip(paths, pages):
+        if extract_data_page(page) != extract_data_page_full_parse(page):
+            print(f"Mismatch between extractors on {path}")
+            sys.exit(1)
+
+    total = len(pages) * args.rounds
+    full_parse = time_extractor(extract_data_page_full_parse, pages, args.rounds)
+    targeted = time_extractor(extract_data_page, pages, args.rounds)
+
+    print(f"{len(pages)} pages x {args.rounds} rounds")
+    print(f"BeautifulSoup full parse: {full_parse / total * 1000:8.3f} ms/page")
+    print(f"extract_data_page:        {targeted / total * 1000:8.3f} ms/page")
+    print(f"Speedup: {full_parse / targeted:.1f}x")
+
+if __name__ == "__main__":
+    main()
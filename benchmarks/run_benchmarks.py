@@ -0,0 +1,295 @@
+import argparse
+import contextlib
+import copy
+import glob
+import io
+import json
+import os
+import platform
+import runpy
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Allow running as 'python benchmarks/run_benchmarks.py' from the repo root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# Offline benchmark suite for the parsing and export paths.
+#
+# Every benchmark runs against the fixtures in benchmarks/fixtures, so no network
+# access is needed. The fixtures are synthetic, generated in the shape of the real
+# responses rather than recorded from the live sites:
+#   yc_pages/        YC company pages with data-page payloads
+#   yc_news/         newsUrl JSON responses for the same companies
+#   crunchbase/      Crunchbase organization profiles
+#   crunchbase_api/  Crunchbase API entity pages and a search page
+# create_CSV.py and exl.py run on a dataset built from the YC fixtures.
+#
+# Each benchmark reports throughput (from its fastest round), per-call latency
+# percentiles and peak traced memory. Throughput and memory are compared with
+# baseline.json, and a result worse than the tolerance allows exits with
+# status 1; --update-baseline records the current numbers instead (baselines
+# are per machine).
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, 'fixtures')
+DEFAULT_BASELINE_FILE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+DEFAULT_ROUNDS = 20
+DEFAULT_COMPANIES = 1000  # Size of the dataset given to create_CSV.py and exl.py
+DEFAULT_TOLERANCE = 0.25  # Allowed drop in throughput
+DEFAULT_MEMORY_TOLERANCE = 0.10  # Allowed growth in peak memory
+
+def read_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def fixture_paths(directory, pattern):
+    return sorted(glob.glob(os.path.join(FIXTURES_DIR, directory, pattern)))
+
+def fixture_slug(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+# Each setup function returns (call, inputs, units_per_call): call(input) is timed
+# once per input per round, and throughput counts units_per_call items per call.
+
+def setup_parse_company_page(work_dir, options):
+    from scrape_yc_companies import parse_company_page
+    pages = [(read_text(path), path) for path in fixture_paths('yc_pages', '*.html')]
+    return (lambda page: parse_company_page(*page)), pages, 1
+
+def setup_merge_news_items(work_dir, options):
+    from scrape_yc_companies import parse_company_page, handle_news_response
+    inputs = []
+    for path in fixture_paths('yc_news', '*.json'):
+        page_path = os.path.join(FIXTURES_DIR, 'yc_pages', fixture_slug(path) + '.html')
+        company_info, news_url = parse_company_page(read_text(page_path), page_path)
+        inputs.append((company_info['latest_news'], news_url, read_text(path)))
+
+    def call(item):
+        latest_news, news_url, body = item
+        company_info = {"latest_news": list(latest_news)}
+        handle_news_response(company_info, news_url, news_url, 200, body)
+    return call, inputs, 1
+
+def setup_crunchbase_profile(work_dir, options):
+    from crunchbase_parser import parse_profile
+    return parse_profile, [read_text(path) for path in fixture_paths('crunchbase', '*.html')], 1
+
+def import_api_scraper(work_dir):
+    # The scraper exits at import without a key and logs to its working directory
+    os.environ.setdefault('CRUNCHBASE_API_KEY', 'offline-benchmark')
+    sys.path.insert(0, os.path.join(ROOT_DIR, 'Crunchbase'))
+    with working_directory(work_dir):
+        import crunchbase_api_scraper
+    return crunchbase_api_scraper
+
+def setup_api_pages(work_dir, options):
+    scraper = import_api_scraper(work_dir)
+    pages = [read_json(path) for path in fixture_paths('crunchbase_api', 'organizations-page-*.json')]
+
+    def call(page):
+        for item in page['data']['items']:
+            scraper.prepare_row(scraper.extract_company_data(item))
+    return call, pages, len(pages[0]['data']['items'])
+
+def setup_api_search(work_dir, options):
+    scraper = import_api_scraper(work_dir)
+    pages = [read_json(path) for path in fixture_paths('crunchbase_api', 'search-page-*.json')]
+
+    def call(page):
+        for entity in page['entities']:
+            scraper.prepare_row(scraper.extract_company_data(scraper.organization_from_search(entity)))
+    return call, pages, len(pages[0]['entities'])
+
+def build_dataset(work_dir, companies):
+    """
+    Write a yc_companies_data.json of 'companies' records made from the YC page
+    and newsUrl fixtures (copies get their own name, slug and website).
+    """
+    path = os.path.join(work_dir, 'yc_companies_data.json')
+    if os.path.exists(path):
+        return path
+    from scrape_yc_companies import parse_company_page, handle_news_response
+    records = []
+    for page_path in fixture_paths('yc_pages', '*.html'):
+        company_info, news_url = parse_company_page(read_text(page_path), page_path)
+        news_path = os.path.join(FIXTURES_DIR, 'yc_news', fixture_slug(page_path) + '.json')
+        if os.path.exists(news_path):
+            handle_news_response(company_info, page_path, news_url, 200, read_text(news_path))
+        records.append(company_info)
+
+    dataset = []
+    for index in range(companies):
+        company = copy.deepcopy(records[index % len(records)])
+        company['name'] = f"{company['name']} {index}"
+        company['slug'] = f"{company.get('slug') or 'company'}-{index}"
+        company['website'] = f"https://company-{index}.example.com"
+        dataset.append(company)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dataset, f, indent=4)
+    return path
+
+def script_runner(script, work_dir, arguments):
+    def call(_):
+        argv = sys.argv
+        sys.argv = [script] + arguments
+        try:
+            with working_directory(work_dir), contextlib.redirect_stdout(io.StringIO()):
+                runpy.run_path(os.path.join(ROOT_DIR, script), run_name='__main__')
+        finally:
+            sys.argv = argv
+    return call
+
+def setup_create_csv(work_dir, options):
+    dataset = build_dataset(work_dir, options.companies)
+    call = script_runner('create_CSV.py', work_dir, [dataset, '--output', os.path.join(work_dir, 'out.csv')])
+    return call, [dataset], options.companies
+
+def setup_exl(work_dir, options):
+    import openpyxl  # noqa: F401 (skip the benchmark when it isn't installed)
+    dataset = build_dataset(work_dir, options.companies)
+    return script_runner('exl.py', work_dir, [dataset]), [dataset], options.companies
+
+BENCHMARKS = {
+    'parse_company_page': setup_parse_company_page,
+    'merge_news_items': setup_merge_news_items,
+    'crunchbase_parse_profile': setup_crunchbase_profile,
+    'api_extract_company_data': setup_api_pages,
+    'api_search_extract': setup_api_search,
+    'create_csv': setup_create_csv,
+    'exl': setup_exl,
+}
+
+def run_benchmark(call, inputs, units_per_call, rounds):
+    # Warm-up pass (imports, caches) is left out of the numbers
+    for item in inputs:
+        call(item)
+
+    latencies = []
+    round_times = []
+    for _ in range(rounds):
+        round_started = time.perf_counter()
+        for item in inputs:
+            started = time.perf_counter()
+            call(item)
+            latencies.append(time.perf_counter() - started)
+        round_times.append(time.perf_counter() - round_started)
+    latencies.sort()
+
+    # Memory is traced in a separate pass, since tracing slows every allocation down
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            call(item)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        # From the fastest round, like timeit: slower rounds measure other load on the machine
+        'throughput': round(len(inputs) * units_per_call / min(round_times), 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+def regressions(name, result, baseline, tolerance, memory_tolerance):
+    """
+    Return a description of each metric of result that is worse than the
+    baseline allows.
+    """
+    problems = []
+    if result['throughput'] < baseline['throughput'] * (1 - tolerance):
+        problems.append(f"{name}: throughput {result['throughput']}/s is below baseline {baseline['throughput']}/s")
+    if result['peak_kib'] > baseline['peak_kib'] * (1 + memory_tolerance):
+        problems.append(f"{name}: peak memory {result['peak_kib']} KiB is above baseline {baseline['peak_kib']} KiB")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmarks and compare them with the stored baseline")
+    parser.add_argument("--only", action="append", choices=list(BENCHMARKS), help="Run only this benchmark, repeatable")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS,
+                        help=f"Timed passes over each benchmark's inputs (default: {DEFAULT_ROUNDS})")
+    parser.add_argument("--companies", type=int, default=DEFAULT_COMPANIES,
+                        help=f"Companies in the create_CSV.py / exl.py dataset (default: {DEFAULT_COMPANIES})")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_FILE, help="Baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed throughput drop as a fraction (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE,
+                        help=f"Allowed peak memory growth as a fraction (default: {DEFAULT_MEMORY_TOLERANCE})")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = read_json(args.baseline) if os.path.exists(args.baseline) else {}
+    if baseline.get('companies', args.companies) != args.companies and not args.update_baseline:
+        print(f"Baseline was recorded with --companies {baseline['companies']}; "
+              f"create_csv and exl results aren't comparable.")
+    baseline_results = baseline.get('benchmarks', {})
+
+    results = {}
+    problems = []
+    print(f"{'benchmark':<26} {'items/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>10}  vs baseline")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in args.only or BENCHMARKS:
+            try:
+                call, inputs, units_per_call = BENCHMARKS[name](work_dir, args)
+            except ImportError as e:
+                print(f"{name:<26} skipped ({e})")
+                continue
+            result = results[name] = run_benchmark(call, inputs, units_per_call, args.rounds)
+
+            previous = baseline_results.get(name)
+            if previous is None:
+                comparison = "no baseline"
+            else:
+                comparison = f"{(result['throughput'] / previous['throughput'] - 1) * 100:+.1f}% throughput"
+                problems.extend(regressions(name, result, previous, args.tolerance, args.memory_tolerance))
+            print(f"{name:<26} {result['throughput']:>10} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+                  f"{result['p99_ms']:>9} {result['peak_kib']:>10}  {comparison}")
+
+    if args.update_baseline:
+        # Benchmarks that were skipped or not selected keep their old numbers
+        baseline_results.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'rounds': args.rounds,
+                'companies': args.companies,
+                'benchmarks': baseline_results,
+            }, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to '{args.baseline}'.")
+        return
+
+    if problems:
+        print("\nREGRESSIONS:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,21 @@
-import pandas as pd
+import csv
+import os
 import time
 import random
 import logging
+import argparse
+import functools
+import queue
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager  # For automatic driver management
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from crunchbase_parser import parse_profile, empty_profile, FIELDS
 
 # ------------------------------
 # Configure Logging
@@ -69,11 +74,72 @@ page_id = [
 # Base URL for Crunchbase organization pages
 baseurl = 'https://www.crunchbase.com/organization/'
 
+# Output files
+OUTPUT_FILE = 'crunchbase_data.csv'
+RETRY_FILE = 'crunchbase_retry.txt'
+ID_COLUMN = 'Identifier'
+
+# Driver pool defaults
+DEFAULT_DRIVERS = 1
+DEFAULT_RECYCLE_AFTER = 25  # Pages a driver loads before it is restarted
+DEFAULT_DELAY = (5, 10)  # Seconds each driver waits between pages
+
+# Requests blocked in lightweight mode, by resource type. The parser only needs
+# the document and the scripts that render it.
+BLOCKED_RESOURCES = {
+    'images': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.avif'],
+    'fonts': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'stylesheets': ['*.css'],
+    'media': ['*.mp4', '*.webm', '*.mp3'],
+    'analytics': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*googlesyndication.com*', '*facebook.net*', '*hotjar.com*', '*segment.com*',
+        '*segment.io*', '*intercom.io*', '*fullstory.com*', '*hubspot.com*', '*adsrvr.org*',
+    ],
+}
+
+def blocked_url_patterns(allow=()):
+    """
+    Return the URL patterns to block, leaving out any resource type or
+    individual pattern named in allow.
+    """
+    return [
+        pattern
+        for resource_type, patterns in BLOCKED_RESOURCES.items() if resource_type not in allow
+        for pattern in patterns if pattern not in allow
+    ]
+
+# Page readiness: the DOM sections scrape_crunchbase reads, by name
+READY_SELECTORS = {
+    'field formatters': '.component--field-formatter',
+    'founders': 'section#founders',
+    'executives': 'section#executives',
+    'investors': 'section#investors',
+    'acquisitions': 'section#acquisitions',
+    'products': 'section#products',
+    'competitors': 'section#competitors',
+    'social media': 'div.social-media-links',
+}
+DEFAULT_READY_TIMEOUT = 4  # Upper bound on the wait for the sections above
+DEFAULT_READY_SETTLE = 2.0  # Stop waiting once no new section has appeared for this long
+READY_POLL = 0.2
+
 # ------------------------------
 # Initialize Selenium WebDriver
 # ------------------------------
 
-def init_driver():
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+def chromedriver_path():
+    # Install ChromeDriver once, not once per driver in the pool
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+def init_driver(lightweight=False, allow=()):
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # Run Chrome in headless mode
     chrome_options.add_argument("--disable-gpu")
@@ -83,50 +149,69 @@ def init_driver():
     # Randomize User-Agent
     user_agent = random.choice(AGENTS)
     chrome_options.add_argument(f'user-agent={user_agent}')
+
+    if lightweight:
+        # Low-bandwidth profile: no image decoding, extensions or background work
+        if 'images' not in allow:
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--mute-audio")
     
     # Setup ChromeDriver using Service and WebDriver Manager
-    service = ChromeService(ChromeDriverManager().install())  # Automatically manages ChromeDriver
+    service = ChromeService(chromedriver_path())  # Automatically manages ChromeDriver
     driver = webdriver.Chrome(service=service, options=chrome_options)
+
+    if lightweight:
+        # Drop fonts, stylesheets, analytics etc. before they are requested
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns(allow)})
     
     return driver
 
 # ------------------------------
-# Safe Extraction Function
+# Page Readiness
 # ------------------------------
 
-def safe_find(soup, tag, **kwargs):
-    element = soup.find(tag, **kwargs)
-    return element.get_text(strip=True) if element else ''
+def missing_sections(driver):
+    missing = driver.execute_script(
+        "return arguments[0].filter(selector => !document.querySelector(selector));",
+        list(READY_SELECTORS.values())
+    )
+    return [name for name, selector in READY_SELECTORS.items() if selector in missing]
+
+def wait_for_sections(driver, url, timeout=DEFAULT_READY_TIMEOUT, settle=DEFAULT_READY_SETTLE):
+    """
+    Wait until every section in READY_SELECTORS is in the DOM, or until none has
+    appeared for settle seconds (not every profile has every section), but
+    never longer than timeout. Returns the sections still missing, which are logged.
+    """
+    start = time.monotonic()
+    missing = missing_sections(driver)
+    last_change = start
+    while missing:
+        now = time.monotonic()
+        if now - start >= timeout:
+            logging.warning(f"Sections still missing after {timeout}s on {url}: {', '.join(missing)}")
+            break
+        if now - last_change >= settle:
+            logging.info(f"Sections not rendered {settle}s after the last change on {url}: {', '.join(missing)}")
+            break
+        time.sleep(READY_POLL)
+        current = missing_sections(driver)
+        if current != missing:
+            missing = current
+            last_change = time.monotonic()
+    return missing
 
 # ------------------------------
 # Scraping Function
 # ------------------------------
 
-def scrape_crunchbase(driver, url):
-    data = {
-        'Name': '',
-        'Description': '',
-        'Funding': '',
-        'Location': '',
-        'Industry': '',
-        'Stage': '',
-        'Founding Date': '',
-        'Website': '',
-        'Number of Employees': '',
-        'Headquarters Address': '',
-        'Founders': '',
-        'Key Executives': '',
-        'Investors': '',
-        'Acquisitions': '',
-        'Products': '',
-        'Competitors': '',
-        'Revenue': '',
-        'Last Funding Date': '',
-        'Total Funding Amount': '',
-        'Social Media Profiles': '',
-        'Company Type': '',
-        'Stock Exchange Listing': ''
-    }
+def scrape_crunchbase(driver, url, ready_timeout=DEFAULT_READY_TIMEOUT, ready_settle=DEFAULT_READY_SETTLE):
+    data = empty_profile()
     
     try:
         driver.get(url)
@@ -136,242 +221,269 @@ def scrape_crunchbase(driver, url):
             EC.presence_of_element_located((By.CLASS_NAME, 'profile-name'))
         )
         
-        # Optional: Scroll to the bottom to load all dynamic content
+        # Scroll to the bottom to load all dynamic content, then wait only as long
+        # as the sections we parse are still rendering
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(random.uniform(2, 4))  # Short sleep to allow content to load
-        
-        # Get page source and parse with BeautifulSoup
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        # ------------------------------
-        # Extract Company Name
-        # ------------------------------
-        data['Name'] = safe_find(soup, 'h1', class_='profile-name')
-        
-        # ------------------------------
-        # Extract Description
-        # ------------------------------
-        data['Description'] = safe_find(soup, 'span', class_='component--field-formatter field-type-text_long ng-star-inserted')
-        
-        # ------------------------------
-        # Extract Location
-        # ------------------------------
-        data['Location'] = safe_find(soup, 'span', class_='component--field-formatter field-type-identifier-multi')
-        
-        # ------------------------------
-        # Extract Funding
-        # ------------------------------
-        funding_tag = soup.find('a', class_='cb-link component--field-formatter field-type-money ng-star-inserted')
-        if funding_tag:
-            data['Funding'] = funding_tag.get_text(strip=True)
-        
-        # ------------------------------
-        # Extract Industry, Stage, Founding Date
-        # ------------------------------
-        section2 = soup.find('div', class_='layout-wrap layout-row')
-        if section2:
-            # Industry
-            indus_tag = section2.find('identifier-multi-formatter', class_='ng-star-inserted')
-            if indus_tag:
-                data['Industry'] = indus_tag.get_text(strip=True)
-            
-            # Founding Date
-            date_tag = section2.find('span', class_='component--field-formatter field-type-date_precision ng-star-inserted')
-            if date_tag:
-                data['Founding Date'] = date_tag.get_text(strip=True)
-            
-            # Funding Stage
-            stage_tags = section2.find_all('span', class_='component--field-formatter field-type-enum ng-star-inserted')
-            if len(stage_tags) > 1:
-                data['Stage'] = stage_tags[1].get('title', '').strip()
-        
-        # ------------------------------
-        # Extract Website URL
-        # ------------------------------
-        website_tag = soup.find('a', class_='component--field-formatter field-type-url ng-star-inserted')
-        if website_tag:
-            data['Website'] = website_tag.get('href', '').strip()
+        wait_for_sections(driver, url, ready_timeout, ready_settle)
         
-        # ------------------------------
-        # Extract Number of Employees
-        # ------------------------------
-        emp_label = soup.find('span', string='Number of Employees')
-        if emp_label:
-            emp_value = emp_label.find_next('span', class_='component--field-formatter field-type-enum ng-star-inserted')
-            if emp_value:
-                data['Number of Employees'] = emp_value.get_text(strip=True)
-        
-        # ------------------------------
-        # Extract Headquarters Address
-        # ------------------------------
-        hq_label = soup.find('span', string='Headquarters Address')
-        if hq_label:
-            hq_value = hq_label.find_next('span', class_='component--field-formatter field-type-address ng-star-inserted')
-            if hq_value:
-                data['Headquarters Address'] = hq_value.get_text(strip=True)
-        
-        # ------------------------------
-        # Extract Founders
-        # ------------------------------
-        founders_section = soup.find('section', id='founders')
-        if founders_section:
-            founders = founders_section.find_all('a', class_='cb-link')
-            founders_list = [founder.get_text(strip=True) for founder in founders]
-            data['Founders'] = ', '.join(founders_list)
-        
-        # ------------------------------
-        # Extract Key Executives
-        # ------------------------------
-        executives_section = soup.find('section', id='executives')
-        if executives_section:
-            executives = executives_section.find_all('a', class_='cb-link')
-            executives_list = [exec.get_text(strip=True) for exec in executives]
-            data['Key Executives'] = ', '.join(executives_list)
-        
-        # ------------------------------
-        # Extract Investors
-        # ------------------------------
-        investors_section = soup.find('section', id='investors')
-        if investors_section:
-            investors = investors_section.find_all('a', class_='cb-link')
-            investors_list = [inv.get_text(strip=True) for inv in investors]
-            data['Investors'] = ', '.join(investors_list)
-        
-        # ------------------------------
-        # Extract Acquisitions
-        # ------------------------------
-        acquisitions_section = soup.find('section', id='acquisitions')
-        if acquisitions_section:
-            acquisitions = acquisitions_section.find_all('a', class_='cb-link')
-            acquisitions_list = [acq.get_text(strip=True) for acq in acquisitions]
-            data['Acquisitions'] = ', '.join(acquisitions_list)
-        
-        # ------------------------------
-        # Extract Products
-        # ------------------------------
-        products_section = soup.find('section', id='products')
-        if products_section:
-            products = products_section.find_all('a', class_='cb-link')
-            products_list = [prod.get_text(strip=True) for prod in products]
-            data['Products'] = ', '.join(products_list)
-        
-        # ------------------------------
-        # Extract Competitors
-        # ------------------------------
-        competitors_section = soup.find('section', id='competitors')
-        if competitors_section:
-            competitors = competitors_section.find_all('a', class_='cb-link')
-            competitors_list = [comp.get_text(strip=True) for comp in competitors]
-            data['Competitors'] = ', '.join(competitors_list)
-        
-        # ------------------------------
-        # Extract Revenue
-        # ------------------------------
-        revenue_label = soup.find('span', string='Revenue')
-        if revenue_label:
-            revenue_value = revenue_label.find_next('span', class_='component--field-formatter field-type-money ng-star-inserted')
-            if revenue_value:
-                data['Revenue'] = revenue_value.get_text(strip=True)
-        
-        # ------------------------------
-        # Extract Last Funding Date
-        # ------------------------------
-        last_funding_label = soup.find('span', string='Last Funding Date')
-        if last_funding_label:
-            last_funding_value = last_funding_label.find_next('span', class_='component--field-formatter field-type-date ng-star-inserted')
-            if last_funding_value:
-                data['Last Funding Date'] = last_funding_value.get_text(strip=True)
-        
-        # ------------------------------
-        # Extract Total Funding Amount
-        # ------------------------------
-        total_funding_label = soup.find('span', string='Total Funding Amount')
-        if total_funding_label:
-            total_funding_value = total_funding_label.find_next('span', class_='component--field-formatter field-type-money ng-star-inserted')
-            if total_funding_value:
-                data['Total Funding Amount'] = total_funding_value.get_text(strip=True)
-        
-        # ------------------------------
-        # Extract Social Media Profiles
-        # ------------------------------
-        social_media_section = soup.find('div', class_='social-media-links')
-        if social_media_section:
-            social_links = social_media_section.find_all('a', class_='social-link')
-            social_profiles = [link.get('href', '').strip() for link in social_links]
-            data['Social Media Profiles'] = ', '.join(social_profiles)
-        
-        # ------------------------------
-        # Extract Company Type
-        # ------------------------------
-        company_type_label = soup.find('span', string='Company Type')
-        if company_type_label:
-            company_type_value = company_type_label.find_next('span', class_='component--field-formatter field-type-enum ng-star-inserted')
-            if company_type_value:
-                data['Company Type'] = company_type_value.get_text(strip=True)
-        
-        # ------------------------------
-        # Extract Stock Exchange Listing
-        # ------------------------------
-        stock_exchange_label = soup.find('span', string='Stock Exchange Listing')
-        if stock_exchange_label:
-            stock_exchange_value = stock_exchange_label.find_next('span', class_='component--field-formatter field-type-enum ng-star-inserted')
-            if stock_exchange_value:
-                data['Stock Exchange Listing'] = stock_exchange_value.get_text(strip=True)
+        # Parse the page source in one pass (see crunchbase_parser.py)
+        data = parse_profile(driver.page_source)
         
         logging.info(f"Successfully scraped: {url}")
     
     except TimeoutException:
         logging.error(f"Timeout while loading page: {url}")
+        return None
     except Exception as e:
         logging.error(f"Error scraping {url}: {e}")
+        return None
     
     return data
 
+# ------------------------------
+# Checkpointed Output
+# ------------------------------
+
+class CheckpointWriter:
+    """
+    Append one CSV row per finished profile and flush it immediately, so a crash
+    loses at most the pages in flight. Rows are written in page_id order: results
+    that finish early wait in a small buffer until the ones before them are done.
+    Failed identifiers go to the retry file instead of the CSV.
+    """
+
+    def __init__(self, path=OUTPUT_FILE, retry_path=RETRY_FILE):
+        self.path = path
+        self.retry_path = retry_path
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.next_index = 0
+        self.written = 0
+        self.failed = 0
+
+    def load_done(self):
+        """
+        Return the identifiers already written to the CSV.
+        """
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                # A row cut short by a crash is missing its last columns
+                if row.get(ID_COLUMN) and row.get(FIELDS[-1]) is not None:
+                    done.add(row[ID_COLUMN])
+        return done
+
+    def open(self, resume=False):
+        # A fresh run starts a new CSV, --resume keeps appending to the old one
+        if resume and os.path.exists(self.path):
+            with open(self.path, 'rb+') as f:
+                content = f.read()
+                if content and not content.endswith(b'\n'):
+                    # Drop a partial row from a crash mid-write
+                    f.truncate(content.rfind(b'\n') + 1)
+        append = resume and os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        self.file = open(self.path, 'a' if append else 'w', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=[ID_COLUMN] + FIELDS, lineterminator='\n')
+        if not append:
+            self.writer.writeheader()
+            self.file.flush()
+        self.retry_file = open(self.retry_path, 'w', encoding='utf-8')
+
+    def _write(self, pid, data):
+        if data is None:
+            self.retry_file.write(pid + '\n')
+            self.retry_file.flush()
+            self.failed += 1
+        else:
+            self.writer.writerow({ID_COLUMN: pid, **data})
+            self.file.flush()
+            self.written += 1
+
+    def put(self, index, pid, data):
+        with self.lock:
+            self.pending[index] = (pid, data)
+            while self.next_index in self.pending:
+                self._write(*self.pending.pop(self.next_index))
+                self.next_index += 1
+
+    def close(self):
+        # Rows held behind a result that never arrived are still written, out of
+        # order, so a partial run loses nothing and --resume picks up the rest
+        with self.lock:
+            if self.pending:
+                logging.warning(f"Results missing from index {self.next_index}; "
+                                f"writing {len(self.pending)} later results out of order.")
+            for index in sorted(self.pending):
+                self._write(*self.pending[index])
+            self.pending = {}
+        self.file.close()
+        self.retry_file.close()
+
+# ------------------------------
+# Driver Pool
+# ------------------------------
+
+def driver_alive(driver):
+    try:
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+
+def start_driver(worker_id, make_driver):
+    """
+    Start a driver, or return None (logged) if Chrome or ChromeDriver fails to start.
+    """
+    try:
+        return make_driver()
+    except Exception as e:
+        logging.error(f"[driver {worker_id}] Failed to start the Selenium driver: {e}")
+        return None
+
+def scrape_worker(worker_id, jobs, total, on_result, recycle_after, delay, ready_timeout, ready_settle, make_driver):
+    """
+    Take (index, pid) jobs from the shared queue until it is empty, passing each
+    result (None if the page failed) to on_result(index, pid, data). The driver is restarted after recycle_after pages or
+    when it crashes; a page that crashed the driver is retried once on the new one. If no driver can be
+    started, the page is reported as failed and the next page tries again.
+    """
+    driver = None
+    pages = 0
+    while True:
+        try:
+            index, pid = jobs.get_nowait()
+        except queue.Empty:
+            break
+
+        url = baseurl + pid
+        data = None
+        for attempt in range(2):
+            if driver is None:
+                driver = start_driver(worker_id, make_driver)
+                if driver is None:
+                    break
+                pages = 0
+            logging.info(f"[driver {worker_id}] Scraping ({index + 1}/{total}) URL: {url}")
+            print(f"[driver {worker_id}] Scraping ({index + 1}/{total}) URL: {url}")
+            data = scrape_crunchbase(driver, url, ready_timeout, ready_settle)
+            pages += 1
+            if driver_alive(driver):
+                break
+            logging.warning(f"[driver {worker_id}] Driver crashed on {url}, restarting it.")
+            quit_driver(driver)
+            driver = None
+        on_result(index, pid, data)
+
+        if driver is not None and pages >= recycle_after:
+            logging.info(f"[driver {worker_id}] Recycling the driver after {pages} pages.")
+            quit_driver(driver)
+            driver = None
+
+        # Randomized delay to mimic human behavior, paced per driver
+        if not jobs.empty():
+            sleep_time = random.uniform(*delay)
+            logging.info(f"[driver {worker_id}] Sleeping for {sleep_time:.2f} seconds...")
+            time.sleep(sleep_time)
+
+    if driver is not None:
+        quit_driver(driver)
+    logging.info(f"[driver {worker_id}] Closed the Selenium driver.")
+
+def scrape_all(page_ids, on_result, drivers=DEFAULT_DRIVERS, recycle_after=DEFAULT_RECYCLE_AFTER, delay=DEFAULT_DELAY,
+               ready_timeout=DEFAULT_READY_TIMEOUT, make_driver=init_driver, ready_settle=DEFAULT_READY_SETTLE):
+    """
+    Scrape page_ids with a pool of headless drivers pulling from a shared queue,
+    calling on_result(index, pid, data) as each page finishes.
+    """
+    jobs = queue.Queue()
+    for index, pid in enumerate(page_ids):
+        jobs.put((index, pid))
+
+    workers = [
+        threading.Thread(
+            target=scrape_worker,
+            args=(worker_id, jobs, len(page_ids), on_result, recycle_after, delay, ready_timeout, ready_settle,
+                  make_driver),
+            daemon=True
+        )
+        for worker_id in range(1, min(drivers, len(page_ids)) + 1)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
 # ------------------------------
 # Main Scraping Loop
 # ------------------------------
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape Crunchbase organization pages with a pool of headless drivers")
+    parser.add_argument("--limit", type=int, default=10,
+                        help="Number of page_id entries to scrape (default: 10); --ids-file is always scraped in full")
+    parser.add_argument("--drivers", type=int, default=DEFAULT_DRIVERS,
+                        help=f"Headless Chrome instances scraping in parallel (default: {DEFAULT_DRIVERS})")
+    parser.add_argument("--recycle-after", type=int, default=DEFAULT_RECYCLE_AFTER,
+                        help=f"Restart each driver after this many pages (default: {DEFAULT_RECYCLE_AFTER})")
+    parser.add_argument("--min-delay", type=float, default=DEFAULT_DELAY[0],
+                        help="Minimum seconds each driver waits between pages")
+    parser.add_argument("--max-delay", type=float, default=DEFAULT_DELAY[1],
+                        help="Maximum seconds each driver waits between pages")
+    parser.add_argument("--ready-timeout", type=float, default=DEFAULT_READY_TIMEOUT,
+                        help=f"Maximum seconds to wait for the profile sections to render (default: {DEFAULT_READY_TIMEOUT})")
+    parser.add_argument("--ready-settle", type=float, default=DEFAULT_READY_SETTLE,
+                        help="Stop waiting once no new section has rendered for this many seconds "
+                             f"(default: {DEFAULT_READY_SETTLE})")
+    parser.add_argument("--lightweight", action="store_true",
+                        help="Block images, fonts, stylesheets, media and analytics requests")
+    parser.add_argument("--allow", action="append", default=[],
+                        help=f"With --lightweight, keep loading a resource type ({', '.join(BLOCKED_RESOURCES)}) "
+                             "or a URL pattern such as '*.css'; repeatable")
+    parser.add_argument("--ids-file", help=f"Scrape the identifiers in this file (one per line, e.g. {RETRY_FILE}) instead of page_id")
+    parser.add_argument("--output", default=OUTPUT_FILE, help=f"CSV written one row per profile (default: {OUTPUT_FILE})")
+    parser.add_argument("--retry-file", default=RETRY_FILE, help=f"Where failed identifiers are listed (default: {RETRY_FILE})")
+    parser.add_argument("--resume", action="store_true", help="Append to --output and skip identifiers already in it")
+    return parser.parse_args()
+
 def main():
-    driver = init_driver()
-    scraped_data = []
-    
-    # Define the limit for testing
-    LIMIT = 10  # Number of entries to scrape for testing
-    
-    # Slice the page_id list to process only the first 'LIMIT' entries
-    for idx, pid in enumerate(page_id[:LIMIT], start=1):
-        # Construct the full URL
-        url = baseurl + pid
-        logging.info(f"Scraping ({idx}/{LIMIT}) URL: {url}")
-        print(f"Scraping ({idx}/{LIMIT}) URL: {url}")
-        
-        # Scrape data
-        data = scrape_crunchbase(driver, url)
-        scraped_data.append(data)
-        
-        # Randomized delay to mimic human behavior
-        sleep_time = random.uniform(5, 10)  # 5 to 10 seconds
-        logging.info(f"Sleeping for {sleep_time:.2f} seconds...\n")
-        print(f"Sleeping for {sleep_time:.2f} seconds...\n")
-        time.sleep(sleep_time)
-    
-    # Close the driver
-    driver.quit()
-    logging.info("Closed the Selenium driver.")
-    
-    # ------------------------------
-    # Save Data to CSV
-    # ------------------------------
-    df = pd.DataFrame(scraped_data, columns=[
-        'Name', 'Description', 'Funding', 'Location', 'Industry', 'Stage', 
-        'Founding Date', 'Website', 'Number of Employees', 'Headquarters Address',
-        'Founders', 'Key Executives', 'Investors', 'Acquisitions', 'Products',
-        'Competitors', 'Revenue', 'Last Funding Date', 'Total Funding Amount',
-        'Social Media Profiles', 'Company Type', 'Stock Exchange Listing'
-    ])
-    df.to_csv('crunchbase_data.csv', index=False)
-    logging.info("Scraping completed. Data saved to 'crunchbase_data.csv'.")
-    print("Scraping completed. Data saved to 'crunchbase_data.csv'.")
+    args = parse_args()
+
+    make_driver = functools.partial(init_driver, args.lightweight, tuple(args.allow))
+
+    if args.ids_file:
+        # Not limited: the retry file is rewritten by this run, so skipped ids would be lost
+        with open(args.ids_file, 'r', encoding='utf-8') as f:
+            page_ids = [line.strip() for line in f if line.strip()]
+    else:
+        # Slice the list to process only the first 'limit' entries
+        page_ids = page_id[:args.limit]
+    page_ids = list(dict.fromkeys(page_ids))
+
+    writer = CheckpointWriter(args.output, args.retry_file)
+    if args.resume:
+        done = writer.load_done()
+        page_ids = [pid for pid in page_ids if pid not in done]
+        print(f"Resuming: {len(done)} profiles already in '{args.output}', {len(page_ids)} left to scrape.")
+    writer.open(args.resume)
+
+    try:
+        scrape_all(page_ids, writer.put, args.drivers, args.recycle_after,
+                   (args.min_delay, args.max_delay), args.ready_timeout, make_driver, args.ready_settle)
+    finally:
+        writer.close()
+
+    logging.info(f"Scraping completed. {writer.written} profiles saved to '{args.output}', {writer.failed} failed.")
+    print(f"Scraping completed. {writer.written} profiles saved to '{args.output}'.")
+    if writer.failed:
+        print(f"{writer.failed} profiles failed; rerun them with: python cb.py --ids-file {args.retry_file} --resume")
 
 # ------------------------------
 # Execute the Script
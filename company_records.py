@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+from company_store import CompanyStore, StoreWriter, DEFAULT_DB_FILE
+
+# Reading and writing the scraped company records.
+#
+# Three formats are supported:
+#   - .json:  one JSON array (the original yc_companies_data.json)
+#   - .jsonl: one company per line, appended as companies are scraped
+#   - .db:    the SQLite store in company_store.py
+#
+# JSONL output grows by appending, so a run costs as much as the new work instead
+# of re-reading and re-writing the whole dataset. Duplicates from repeated runs
+# are removed by the 'compact' command below.
+
+DEFAULT_JSONL_FILE = 'yc_companies_data.jsonl'
+
+def is_jsonl(path):
+    return path.endswith('.jsonl')
+
+def is_sqlite(path):
+    return path.endswith('.db')
+
+def matches_filters(company, batch_name=None, country=None, year_founded=None):
+    key_details = company.get('key_details', {})
+    return ((batch_name is None or key_details.get('batch_name') == batch_name)
+            and (country is None or key_details.get('country') == country)
+            and (year_founded is None or key_details.get('year_founded') == year_founded))
+
+# Function to yield company records one at a time from a .json, .jsonl or .db file,
+# optionally filtered (an indexed query for .db files)
+def iter_company_records(path, batch_name=None, country=None, year_founded=None):
+    if is_sqlite(path):
+        store = CompanyStore(path)
+        try:
+            yield from store.iter_companies(batch_name, country, year_founded)
+        finally:
+            store.close()
+        return
+
+    for company in _iter_file_records(path):
+        if matches_filters(company, batch_name, country, year_founded):
+            yield company
+
+def _iter_file_records(path):
+    if is_jsonl(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial line from a run that crashed mid-write
+                    continue
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from iter_json_array(f)
+
+# Function to yield the elements of a top-level JSON array from a file object
+# without loading the whole file. Only the current element (plus one read chunk)
+# is held in memory at a time.
+def iter_json_array(f, chunk_size=64 * 1024):
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size)
+    pos = 0
+    eof = False
+
+    def skip(chars):
+        nonlocal buffer, pos, eof
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            buffer, pos = f.read(chunk_size), 0
+            eof = not buffer
+
+    def close_array():
+        # Only whitespace may follow the closing ']', like json.load
+        nonlocal pos
+        pos += 1
+        skip(' \t\r\n')
+        if pos < len(buffer):
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+
+    skip(' \t\r\n')
+    if pos >= len(buffer) or buffer[pos] != '[':
+        raise json.JSONDecodeError("Expected a JSON array", buffer, pos)
+    pos += 1
+    skip(' \t\r\n')
+    if pos < len(buffer) and buffer[pos] == ']':
+        close_array()
+        return
+
+    while True:
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+                # An element must be followed by a separator: a number cut off by the
+                # end of the buffer ('12' of '12345' or '1.' of '1.5') decodes without one
+                if end < len(buffer) and buffer[end] in ' \t\r\n,]':
+                    break
+                if eof:
+                    if end < len(buffer):
+                        raise json.JSONDecodeError("Expecting ',' delimiter", buffer, end)
+                    break
+            except json.JSONDecodeError:
+                # The element continues past the end of the buffer: read more
+                if eof:
+                    raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+        yield element
+        pos = end
+
+        # Exactly one ',' between elements, like json.load
+        skip(' \t\r\n')
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+        if buffer[pos] == ']':
+            close_array()
+            return
+        if buffer[pos] != ',':
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+        pos += 1
+        skip(' \t\r\n')
+
+# Function to return the largest number of founders of any (matching) company.
+# On a .db store this is a single indexed query; other formats are scanned once.
+def max_founders(path, batch_name=None, country=None, year_founded=None):
+    if is_sqlite(path):
+        store = CompanyStore(path)
+        try:
+            return store.max_founders(batch_name, country, year_founded)
+        finally:
+            store.close()
+    return max(
+        (len(company.get('founders', [])) for company in iter_company_records(path, batch_name, country, year_founded)),
+        default=0
+    )
+
+# Appends company records to a .jsonl file, one line each, flushed as they arrive
+class JsonlWriter:
+    def __init__(self, path=DEFAULT_JSONL_FILE):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        self.count = 0
+        if self.file.tell() > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Terminate a partial line so the next record starts cleanly
+                    self.file.write('\n')
+                    self.file.flush()
+
+    def write(self, company):
+        self.file.write(json.dumps(company, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+def dedupe_key(company):
+    # Same rule as the JSON merge in scrape_yc_companies: companies are matched on
+    # 'website', and records without a website are always kept
+    return company.get('website') or None
+
+def compact_jsonl(path):
+    """
+    Remove duplicate companies from a .jsonl file, keeping the most recently
+    appended record for each website. Lines that aren't valid JSON (a partial
+    line from a crash) are dropped. Returns (records_before, records_after, skipped).
+    """
+    # First pass: remember only the line numbers to keep
+    latest = {}
+    keyless = []
+    total = 0
+    skipped = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f):
+            if not line.strip():
+                continue
+            try:
+                company = json.loads(line)
+            except json.JSONDecodeError:
+                skipped += 1
+                continue
+            total += 1
+            key = dedupe_key(company)
+            if key is None:
+                keyless.append(line_no)
+            else:
+                latest[key] = line_no
+    keep_lines = set(latest.values())
+    keep_lines.update(keyless)
+
+    # Second pass: stream the kept lines to a temporary file, then swap it in
+    tmp_path = path + '.tmp'
+    with open(path, 'r', encoding='utf-8') as f, open(tmp_path, 'w', encoding='utf-8') as out:
+        for line_no, line in enumerate(f):
+            if line_no in keep_lines:
+                out.write(line)
+    os.replace(tmp_path, path)
+    return total, len(keep_lines), skipped
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the company datasets")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compact = subparsers.add_parser("compact", help="Remove duplicate companies, keeping the latest record")
+    compact.add_argument("path", nargs="?", default=DEFAULT_JSONL_FILE)
+    load = subparsers.add_parser("import", help="Upsert companies from a .json or .jsonl file into the SQLite store")
+    load.add_argument("input", nargs="?", default='yc_companies_data.json')
+    load.add_argument("--db", default=DEFAULT_DB_FILE)
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        before, after, skipped = compact_jsonl(args.path)
+        print(f"Compacted '{args.path}': {before} records -> {after} records.")
+        if skipped:
+            print(f"Dropped {skipped} lines that weren't valid JSON (partial writes from a crashed run).")
+    elif args.command == "import":
+        # Upserts run in transactions of 1000 companies
+        writer = StoreWriter(CompanyStore(args.db), batch_size=1000)
+        for company in iter_company_records(args.input):
+            writer.write(company)
+        writer.close()
+        print(f"Imported {writer.count} companies from '{args.input}' into '{args.db}'.")
+
+if __name__ == "__main__":
+    main()
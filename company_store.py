@@ -0,0 +1,226 @@
+import re
+import sqlite3
+
+# SQLite storage for the records produced by scrape_yc_companies.extract_company_data.
+#
+# Companies are normalized into three tables (companies, founders, news) and
+# upserted by company slug, so re-scraping a company replaces its row instead of
+# adding a duplicate. Lookups used by the dedupe step and by filtered exports
+# (website, batch_name, country, year_founded) are served by indexes.
+
+DEFAULT_DB_FILE = 'yc_companies.db'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS companies (
+    slug TEXT PRIMARY KEY,
+    name TEXT,
+    one_liner TEXT,
+    website TEXT,
+    long_description TEXT,
+    mission TEXT,
+    batch_name TEXT,
+    year_founded INTEGER,
+    team_size INTEGER,
+    location TEXT,
+    city TEXT,
+    country TEXT,
+    linkedin TEXT,
+    twitter TEXT,
+    facebook TEXT,
+    crunchbase TEXT
+);
+CREATE TABLE IF NOT EXISTS founders (
+    company_slug TEXT NOT NULL REFERENCES companies (slug) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    full_name TEXT,
+    title TEXT,
+    bio TEXT,
+    twitter TEXT,
+    linkedin TEXT,
+    PRIMARY KEY (company_slug, position)
+);
+CREATE TABLE IF NOT EXISTS news (
+    company_slug TEXT NOT NULL REFERENCES companies (slug) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT,
+    url TEXT,
+    date TEXT,
+    PRIMARY KEY (company_slug, position)
+);
+CREATE INDEX IF NOT EXISTS idx_companies_website ON companies (website);
+CREATE INDEX IF NOT EXISTS idx_companies_batch_name ON companies (batch_name);
+CREATE INDEX IF NOT EXISTS idx_companies_country ON companies (country);
+CREATE INDEX IF NOT EXISTS idx_companies_year_founded ON companies (year_founded);
+'''
+
+COMPANY_COLUMNS = [
+    'slug', 'name', 'one_liner', 'website', 'long_description', 'mission',
+    'batch_name', 'year_founded', 'team_size', 'location', 'city', 'country',
+    'linkedin', 'twitter', 'facebook', 'crunchbase'
+]
+
+UPSERT_COMPANY = (
+    f"INSERT INTO companies ({', '.join(COMPANY_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in COMPANY_COLUMNS)}) "
+    f"ON CONFLICT (slug) DO UPDATE SET "
+    + ', '.join(f"{column} = excluded.{column}" for column in COMPANY_COLUMNS[1:])
+)
+
+# Records scraped before 'slug' was captured fall back to YC's slug format
+def company_slug(company):
+    if company.get('slug'):
+        return company['slug']
+    if company.get('name'):
+        return re.sub(r'[^a-z0-9]+', '-', company['name'].lower()).strip('-')
+    return None
+
+class CompanyStore:
+    def __init__(self, path=DEFAULT_DB_FILE):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.executescript(SCHEMA)
+
+    def _company_row(self, slug, company):
+        key_details = company.get('key_details', {})
+        social_media = company.get('social_media', {})
+        return (
+            slug, company.get('name'), company.get('one_liner'), company.get('website'),
+            company.get('long_description'), company.get('mission'),
+            key_details.get('batch_name'), key_details.get('year_founded'), key_details.get('team_size'),
+            key_details.get('location'), key_details.get('city'), key_details.get('country'),
+            social_media.get('linkedin'), social_media.get('twitter'),
+            social_media.get('facebook'), social_media.get('crunchbase'),
+        )
+
+    def upsert_companies(self, companies):
+        """
+        Insert or update companies (keyed by slug) in a single transaction.
+        Founders and news of an updated company are replaced.
+        Returns the number of companies written.
+        """
+        count = 0
+        with self.db:
+            for company in companies:
+                slug = company_slug(company)
+                if not slug:
+                    continue
+                self.db.execute(UPSERT_COMPANY, self._company_row(slug, company))
+                self.db.execute('DELETE FROM founders WHERE company_slug = ?', (slug,))
+                self.db.executemany(
+                    'INSERT INTO founders (company_slug, position, full_name, title, bio, twitter, linkedin) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [
+                        (slug, position, founder.get('full_name'), founder.get('title'), founder.get('bio'),
+                         founder.get('social_links', {}).get('twitter'), founder.get('social_links', {}).get('linkedin'))
+                        for position, founder in enumerate(company.get('founders', []))
+                    ]
+                )
+                self.db.execute('DELETE FROM news WHERE company_slug = ?', (slug,))
+                self.db.executemany(
+                    'INSERT INTO news (company_slug, position, title, url, date) VALUES (?, ?, ?, ?, ?)',
+                    [
+                        (slug, position, news.get('title'), news.get('url'), news.get('date'))
+                        for position, news in enumerate(company.get('latest_news', []))
+                    ]
+                )
+                count += 1
+        return count
+
+    def count(self):
+        return self.db.execute('SELECT COUNT(*) FROM companies').fetchone()[0]
+
+    def _filter_clause(self, batch_name=None, country=None, year_founded=None):
+        where = []
+        params = []
+        for column, value in (('batch_name', batch_name), ('country', country), ('year_founded', year_founded)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        return (' WHERE ' + ' AND '.join(where) if where else ''), params
+
+    def max_founders(self, batch_name=None, country=None, year_founded=None):
+        where, params = self._filter_clause(batch_name, country, year_founded)
+        row = self.db.execute(
+            'SELECT MAX(position) + 1 FROM founders '
+            f'WHERE company_slug IN (SELECT slug FROM companies{where})', params
+        ).fetchone()
+        return row[0] or 0
+
+    def iter_companies(self, batch_name=None, country=None, year_founded=None):
+        """
+        Yield companies in the same nested shape as extract_company_data,
+        optionally filtered on the indexed batch_name / country / year_founded columns.
+        """
+        where, params = self._filter_clause(batch_name, country, year_founded)
+        query = f"SELECT {', '.join(COMPANY_COLUMNS)} FROM companies{where} ORDER BY rowid"
+
+        # Founders and news are looked up per company, so the outer query streams
+        for row in self.db.execute(query, params):
+            company = dict(zip(COMPANY_COLUMNS, row))
+            founders = self.db.execute(
+                'SELECT full_name, title, bio, twitter, linkedin FROM founders '
+                'WHERE company_slug = ? ORDER BY position', (company['slug'],)
+            ).fetchall()
+            news = self.db.execute(
+                'SELECT title, url, date FROM news WHERE company_slug = ? ORDER BY position', (company['slug'],)
+            ).fetchall()
+            yield {
+                "name": company['name'],
+                "slug": company['slug'],
+                "one_liner": company['one_liner'],
+                "website": company['website'],
+                "long_description": company['long_description'],
+                "mission": company['mission'],
+                "key_details": {
+                    "batch_name": company['batch_name'],
+                    "year_founded": company['year_founded'],
+                    "team_size": company['team_size'],
+                    "location": company['location'],
+                    "city": company['city'],
+                    "country": company['country'],
+                },
+                "founders": [
+                    {
+                        "full_name": full_name,
+                        "title": title,
+                        "bio": bio,
+                        "social_links": {"twitter": twitter, "linkedin": linkedin},
+                    }
+                    for full_name, title, bio, twitter, linkedin in founders
+                ],
+                "latest_news": [{"title": title, "url": url, "date": date} for title, url, date in news],
+                "social_media": {
+                    "linkedin": company['linkedin'],
+                    "twitter": company['twitter'],
+                    "facebook": company['facebook'],
+                    "crunchbase": company['crunchbase'],
+                },
+                "footer_info": {}
+            }
+
+    def close(self):
+        self.db.close()
+
+# Buffers companies and upserts them in batches, one transaction per batch
+class StoreWriter:
+    def __init__(self, store, batch_size=100):
+        self.store = store
+        self.batch_size = batch_size
+        self.buffer = []
+        self.count = 0
+
+    def write(self, company):
+        self.buffer.append(company)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.count += self.store.upsert_companies(self.buffer)
+            self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.store.close()
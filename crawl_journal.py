@@ -0,0 +1,52 @@
+import json
+import os
+
+# Append-only checkpoint journal for long crawls.
+#
+# Every finished company is written as one JSON line {"url": ..., "company": {...}}
+# and flushed immediately, so an interrupted run loses at most the page that was
+# in flight. Failed URLs are not recorded and are retried on resume.
+
+DEFAULT_JOURNAL_FILE = 'yc_companies_journal.jsonl'
+
+class CrawlJournal:
+    def __init__(self, path=DEFAULT_JOURNAL_FILE):
+        self.path = path
+        self.file = None
+
+    def load(self):
+        """
+        Return {url: company} for every completed entry in the journal.
+        """
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial last line from a crash mid-write
+                    continue
+                completed[entry['url']] = entry['company']
+        return completed
+
+    def open(self, resume=False):
+        # A fresh run starts a new journal, --resume keeps appending to the old one
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self.file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Terminate a partial line so the next entry starts cleanly
+                    self.file.write('\n')
+                    self.file.flush()
+
+    def record(self, url, company):
+        self.file.write(json.dumps({"url": url, "company": company}, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
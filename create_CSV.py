@@ -1,15 +1,34 @@
-import json
 import csv
+import argparse
+from company_records import iter_company_records, max_founders
 
-# Load your JSON data
-with open('yc_companies_data.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+parser = argparse.ArgumentParser(description="Convert scraped YC companies to CSV")
+parser.add_argument("input", nargs="?", default='yc_companies_data.json',
+                    help="yc_companies_data.json, a .jsonl file or a .db SQLite store")
+parser.add_argument("--batch", help="Only export companies from this batch, e.g. 'Summer 2025'")
+parser.add_argument("--country", help="Only export companies from this country code, e.g. 'US'")
+parser.add_argument("--year", type=int, help="Only export companies founded in this year")
+parser.add_argument("--output", default='yc_companies_data.csv')
+parser.add_argument("--max-founders", default='5',
+                    help="Number of founder column groups, or 'auto' to size them from a pre-scan of the input (default: 5)")
+args = parser.parse_args()
+
+filters = dict(batch_name=args.batch, country=args.country, year_founded=args.year)
 
 # Set maximum number of founders to handle
-MAX_FOUNDERS = 5  # You can change this as needed
+if args.max_founders == 'auto':
+    # Pre-scan so no founder is dropped (a single query on a .db store)
+    MAX_FOUNDERS = max_founders(args.input, **filters)
+else:
+    MAX_FOUNDERS = int(args.max_founders)
+
+# Stream the company records (.json, .jsonl or .db; filters are indexed queries on .db).
+# Rows are written as records are parsed, so memory does not grow with the dataset.
+data = iter_company_records(args.input, **filters)
+truncated = 0
 
 # Open a single CSV file for writing
-with open('yc_companies_data.csv', 'w', newline='', encoding='utf-8') as csv_file:
+with open(args.output, 'w', newline='', encoding='utf-8') as csv_file:
 
     # Define CSV writer
     csv_writer = csv.writer(csv_file)
@@ -31,7 +50,7 @@ with open('yc_companies_data.csv', 'w', newline='', encoding='utf-8') as csv_fil
     # Write the header row to the CSV
     csv_writer.writerow(headers)
 
-    # Loop through the companies in the JSON data
+    # Loop through the companies in the input data
     for company in data:
         # Extract company data
         row = [
@@ -54,6 +73,8 @@ with open('yc_companies_data.csv', 'w', newline='', encoding='utf-8') as csv_fil
 
         # Add founders data
         founders = company.get('founders', [])
+        if len(founders) > MAX_FOUNDERS:
+            truncated += 1
         for i in range(MAX_FOUNDERS):
             if i < len(founders):
                 row.extend([
@@ -69,3 +90,7 @@ with open('yc_companies_data.csv', 'w', newline='', encoding='utf-8') as csv_fil
 
         # Write the row to the CSV
         csv_writer.writerow(row)
+
+if truncated:
+    print(f"Warning: {truncated} companies have more than {MAX_FOUNDERS} founders; "
+          f"the extra founders were dropped. Use --max-founders auto to keep them.")
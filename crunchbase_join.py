@@ -0,0 +1,214 @@
+import argparse
+import csv
+import glob
+import os
+import re
+import sqlite3
+from urllib.parse import urlsplit
+from company_records import iter_company_records, JsonlWriter
+
+# Enrich YC companies with Crunchbase data.
+#
+# The Crunchbase rows (cb.py's crunchbase_data.csv, or any output of the
+# Crunchbase API scraper) are loaded once into two hash indexes:
+#   - Crunchbase slug -> row, from cb.py's Identifier column
+#   - registrable domain of the website -> row (e.g. 'https://www.app.acme.co.uk/x'
+#     and 'acme.co.uk' both become 'acme.co.uk')
+# Each YC company is then looked up by the slug in its social_media.crunchbase URL,
+# falling back to its website's domain, so the join is one linear pass over both
+# datasets instead of comparing every pair.
+#
+# The slugs derived from the YC cb_urls that aren't in the Crunchbase data yet can
+# be written out for cb.py --ids-file, replacing the hand-maintained page_id list.
+
+DEFAULT_CRUNCHBASE_FILES = ['crunchbase_data.csv']  # cb.py's OUTPUT_FILE
+DEFAULT_ENRICHED_FILE = 'yc_companies_enriched.jsonl'
+DEFAULT_IDS_FILE = 'crunchbase_ids.txt'
+
+SLUG_COLUMN = 'Identifier'  # cb.py's ID_COLUMN
+WEBSITE_COLUMN = 'Website'
+
+CRUNCHBASE_URL = re.compile(r'crunchbase\.com/organization/([^/?#\s]+)', re.IGNORECASE)
+
+# Suffixes under which the registrable domain has three labels instead of two.
+# Not the full public suffix list, just the ones that show up in startup websites,
+# plus hosting domains where every subdomain is a different company.
+MULTI_LABEL_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'com.au', 'net.au', 'org.au', 'co.nz', 'co.in', 'net.in',
+    'co.jp', 'co.kr', 'com.br', 'com.mx', 'com.ar', 'com.co', 'com.sg', 'com.hk', 'com.tw',
+    'com.cn', 'com.tr', 'com.ng', 'co.za', 'co.il', 'co.id', 'com.my', 'com.ph', 'com.pk',
+    'github.io', 'herokuapp.com', 'vercel.app', 'netlify.app', 'web.app', 'pages.dev',
+    'notion.site', 'webflow.io', 'framer.website', 'carrd.co',
+}
+
+def crunchbase_slug(url):
+    """
+    Return the organization slug of a Crunchbase URL, or None.
+    """
+    match = CRUNCHBASE_URL.search(url or '')
+    return match.group(1).lower() if match else None
+
+def registrable_domain(url):
+    """
+    Return the lowercased registrable domain of a URL or bare host, or None.
+    """
+    url = (url or '').strip()
+    if not url:
+        return None
+    if '//' not in url:
+        url = '//' + url
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    if not host or '.' not in host:
+        return None
+    labels = host.rstrip('.').split('.')
+    size = 3 if '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES else 2
+    return '.'.join(labels[-size:])
+
+def iter_crunchbase_rows(path):
+    """
+    Yield Crunchbase rows as dicts from a .csv file, a SQLite output (.db) or a
+    Parquet output directory.
+    """
+    if os.path.isdir(path):
+        # Imported here so CSV and SQLite input don't need pyarrow installed
+        import pyarrow.parquet as pq
+        for part in sorted(glob.glob(os.path.join(path, 'part-*.parquet'))):
+            yield from pq.read_table(part).to_pylist()
+    elif path.endswith(('.db', '.sqlite3')):
+        db = sqlite3.connect(path)
+        db.row_factory = sqlite3.Row
+        try:
+            for row in db.execute('SELECT * FROM organizations'):
+                yield dict(row)
+        finally:
+            db.close()
+    else:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+
+class CrunchbaseIndex:
+    def __init__(self):
+        self.by_slug = {}
+        self.by_domain = {}
+        self.rows = 0
+
+    def add(self, row):
+        # Later rows replace earlier ones: the sinks append updated organizations
+        self.rows += 1
+        slug = (row.get(SLUG_COLUMN) or '').strip().lower()
+        if slug:
+            self.by_slug[slug] = row
+        domain = registrable_domain(row.get(WEBSITE_COLUMN))
+        if domain:
+            self.by_domain[domain] = row
+
+    def load(self, path):
+        for row in iter_crunchbase_rows(path):
+            self.add(row)
+
+    def match(self, company):
+        """
+        Return (row, 'slug' or 'domain') for a YC company, or (None, None).
+        """
+        slug = crunchbase_slug(company.get('social_media', {}).get('crunchbase'))
+        if slug and slug in self.by_slug:
+            return self.by_slug[slug], 'slug'
+        domain = registrable_domain(company.get('website'))
+        if domain and domain in self.by_domain:
+            return self.by_domain[domain], 'domain'
+        return None, None
+
+class JoinStats:
+    def __init__(self):
+        self.companies = 0
+        self.with_slug = 0
+        self.with_domain = 0
+        self.matched = {'slug': 0, 'domain': 0}
+
+    def record(self, slug, domain, matched_by):
+        self.companies += 1
+        self.with_slug += slug is not None
+        self.with_domain += domain is not None
+        if matched_by:
+            self.matched[matched_by] += 1
+
+    def summary(self):
+        def rate(count, total):
+            return f"{count}/{total} ({count / total * 100:.1f}%)" if total else f"{count}/0"
+
+        matched = sum(self.matched.values())
+        return '\n'.join([
+            f"Matched:          {rate(matched, self.companies)}",
+            f"  by slug:        {rate(self.matched['slug'], self.with_slug)} of companies with a cb_url",
+            f"  by domain:      {rate(self.matched['domain'], self.with_domain)} of companies with a website",
+            f"Unmatched:        {self.companies - matched}",
+        ])
+
+def enrich_companies(companies, index, stats):
+    """
+    Yield each company with a 'crunchbase' dict (None when unmatched) and the
+    key it was matched on in 'crunchbase_match'.
+    """
+    for company in companies:
+        row, matched_by = index.match(company)
+        stats.record(crunchbase_slug(company.get('social_media', {}).get('crunchbase')),
+                     registrable_domain(company.get('website')), matched_by)
+        company['crunchbase'] = row
+        company['crunchbase_match'] = matched_by
+        yield company
+
+def missing_crunchbase_ids(input_path, index):
+    """
+    Return the slugs of YC cb_urls that aren't in the Crunchbase data, in input order.
+    """
+    slugs = (crunchbase_slug(company.get('social_media', {}).get('crunchbase'))
+             for company in iter_company_records(input_path))
+    return [slug for slug in dict.fromkeys(slugs) if slug and slug not in index.by_slug]
+
+def main():
+    parser = argparse.ArgumentParser(description="Join Crunchbase data onto the scraped YC companies")
+    parser.add_argument("input", nargs="?", default='yc_companies_data.json',
+                        help="YC companies (.json, .jsonl or .db, default: yc_companies_data.json)")
+    parser.add_argument("--crunchbase", action="append",
+                        help="Crunchbase data: cb.py CSV, or the API scraper's CSV, .db or Parquet directory. "
+                             f"Repeatable, later files win (default: {', '.join(DEFAULT_CRUNCHBASE_FILES)})")
+    parser.add_argument("--output", default=DEFAULT_ENRICHED_FILE,
+                        help=f"Enriched companies, one per line (default: {DEFAULT_ENRICHED_FILE})")
+    parser.add_argument("--ids-output", nargs="?", const=DEFAULT_IDS_FILE, default=None,
+                        help=f"Also write the cb_url identifiers missing from the Crunchbase data, "
+                             f"for cb.py --ids-file (default file: {DEFAULT_IDS_FILE})")
+    args = parser.parse_args()
+
+    index = CrunchbaseIndex()
+    for path in args.crunchbase or DEFAULT_CRUNCHBASE_FILES:
+        if not os.path.exists(path):
+            print(f"Crunchbase data '{path}' not found, skipping.")
+            continue
+        index.load(path)
+    print(f"Indexed {index.rows} Crunchbase rows: {len(index.by_slug)} slugs, {len(index.by_domain)} domains.")
+
+    # The enriched output is rewritten on every run
+    if os.path.exists(args.output):
+        os.remove(args.output)
+    stats = JoinStats()
+    writer = JsonlWriter(args.output)
+    try:
+        for company in enrich_companies(iter_company_records(args.input), index, stats):
+            writer.write(company)
+    finally:
+        writer.close()
+    print(stats.summary())
+    print(f"{writer.count} companies written to '{args.output}'.")
+
+    if args.ids_output:
+        ids = missing_crunchbase_ids(args.input, index)
+        with open(args.ids_output, 'w', encoding='utf-8') as f:
+            f.writelines(slug + '\n' for slug in ids)
+        print(f"{len(ids)} Crunchbase identifiers to scrape written to '{args.ids_output}' "
+              f"(python cb.py --ids-file {args.ids_output} --resume).")
+
+if __name__ == "__main__":
+    main()
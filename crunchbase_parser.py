@@ -0,0 +1,203 @@
+import bisect
+from lxml import etree, html as lxml_html
+
+# Single-pass parser for Crunchbase organization profiles.
+#
+# The original scrape_crunchbase ran a separate BeautifulSoup search over the
+# whole tree for every field (about ten label lookups plus their find_next calls).
+# parse_profile walks the lxml tree once, building an index of
+#   - the first element per (tag, class), where class is either a single class
+#     name or the exact class attribute, matching BeautifulSoup's class_ rules
+#   - label text -> position of the first <span> with that text
+#   - class -> positions of <span> elements, so a label's value is found by bisect
+#   - section id -> link texts, for founders, investors and the other sections
+# and then fills the same data dict from the index.
+
+FIELDS = [
+    'Name', 'Description', 'Funding', 'Location', 'Industry', 'Stage',
+    'Founding Date', 'Website', 'Number of Employees', 'Headquarters Address',
+    'Founders', 'Key Executives', 'Investors', 'Acquisitions', 'Products',
+    'Competitors', 'Revenue', 'Last Funding Date', 'Total Funding Amount',
+    'Social Media Profiles', 'Company Type', 'Stock Exchange Listing'
+]
+
+ENUM_CLASS = 'component--field-formatter field-type-enum ng-star-inserted'
+MONEY_CLASS = 'component--field-formatter field-type-money ng-star-inserted'
+
+# Label text -> class of the <span> holding its value (the next one after the label)
+LABEL_VALUE_CLASSES = {
+    'Number of Employees': ENUM_CLASS,
+    'Headquarters Address': 'component--field-formatter field-type-address ng-star-inserted',
+    'Revenue': MONEY_CLASS,
+    'Last Funding Date': 'component--field-formatter field-type-date ng-star-inserted',
+    'Total Funding Amount': MONEY_CLASS,
+    'Company Type': ENUM_CLASS,
+    'Stock Exchange Listing': ENUM_CLASS,
+}
+
+# Section id -> field filled with the comma-separated texts of its cb-link anchors
+SECTION_FIELDS = {
+    'founders': 'Founders',
+    'executives': 'Key Executives',
+    'investors': 'Investors',
+    'acquisitions': 'Acquisitions',
+    'products': 'Products',
+    'competitors': 'Competitors',
+}
+
+LAYOUT_CLASS = 'layout-wrap layout-row'
+DATE_PRECISION_CLASS = 'component--field-formatter field-type-date_precision ng-star-inserted'
+
+# BeautifulSoup's get_text leaves out the contents of these tags
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+def empty_profile():
+    return dict.fromkeys(FIELDS, '')
+
+def iter_strings(element):
+    if isinstance(element.tag, str) and element.tag not in NON_TEXT_TAGS and element.text:
+        yield element.text
+    for child in element:
+        yield from iter_strings(child)
+        if child.tail:
+            yield child.tail
+
+def text_of(element):
+    # Same as BeautifulSoup's get_text(strip=True): stripped strings, joined without a separator
+    return ''.join(text.strip() for text in iter_strings(element))
+
+def string_of(element):
+    # Same as BeautifulSoup's .string: the text of an element whose only child is a string
+    while True:
+        children = list(element)
+        if not children:
+            return element.text or None
+        if len(children) > 1 or element.text or children[0].tail or not isinstance(children[0].tag, str):
+            return None
+        element = children[0]
+
+class ProfileIndex:
+    def __init__(self, root):
+        self.first = {}
+        self.spans = []
+        self.span_positions = {}
+        self.labels = {}
+        self.section_links = {}
+        self.layout_identifier = None
+        self.layout_date = None
+        self.layout_enums = []
+        self.social_links = []
+        self._build(root)
+
+    def _build(self, root):
+        # Elements whose descendants are being collected; like soup.find, only the first match counts
+        open_sections = []
+        open_layout = open_social = None
+        layout_seen = social_seen = False
+
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+
+            if event == 'end':
+                if open_sections and element is open_sections[-1]:
+                    open_sections.pop()
+                elif element is open_layout:
+                    open_layout = None
+                elif element is open_social:
+                    open_social = None
+                continue
+
+            class_names = element.get('class', '').split()
+            class_key = ' '.join(class_names)
+            for key in [class_key] + class_names:
+                self.first.setdefault((tag, key), element)
+
+            if tag == 'span':
+                position = len(self.spans)
+                self.spans.append(element)
+                self.span_positions.setdefault(class_key, []).append(position)
+                label = string_of(element)
+                if label in LABEL_VALUE_CLASSES and label not in self.labels:
+                    self.labels[label] = position
+                if open_layout is not None:
+                    if self.layout_date is None and class_key == DATE_PRECISION_CLASS:
+                        self.layout_date = element
+                    elif class_key == ENUM_CLASS:
+                        self.layout_enums.append(element)
+            elif tag == 'a':
+                if open_sections and 'cb-link' in class_names:
+                    link_text = text_of(element)
+                    for section in open_sections:
+                        self.section_links[section.get('id')].append(link_text)
+                if open_social is not None and 'social-link' in class_names:
+                    self.social_links.append(element.get('href', '').strip())
+            elif tag == 'section':
+                section_id = element.get('id')
+                if section_id in SECTION_FIELDS and section_id not in self.section_links:
+                    self.section_links[section_id] = []
+                    open_sections.append(element)
+            elif tag == 'div':
+                if not layout_seen and class_key == LAYOUT_CLASS:
+                    layout_seen = True
+                    open_layout = element
+                if not social_seen and 'social-media-links' in class_names:
+                    social_seen = True
+                    open_social = element
+            elif tag == 'identifier-multi-formatter':
+                if open_layout is not None and self.layout_identifier is None and 'ng-star-inserted' in class_names:
+                    self.layout_identifier = element
+
+    def find_first(self, tag, class_name):
+        return self.first.get((tag, class_name))
+
+    def label_value(self, label):
+        """
+        Return the first <span> after the label's <span> whose class is the
+        label's value class, like soup.find('span', string=label).find_next(...).
+        """
+        label_position = self.labels.get(label)
+        if label_position is None:
+            return None
+        positions = self.span_positions.get(LABEL_VALUE_CLASSES[label], [])
+        index = bisect.bisect_right(positions, label_position)
+        return self.spans[positions[index]] if index < len(positions) else None
+
+def parse_profile(page_source):
+    """
+    Parse a Crunchbase organization page into the FIELDS dict used by cb.py.
+    """
+    data = empty_profile()
+    index = ProfileIndex(lxml_html.document_fromstring(page_source))
+
+    def first_text(tag, class_name):
+        element = index.find_first(tag, class_name)
+        return text_of(element) if element is not None else ''
+
+    data['Name'] = first_text('h1', 'profile-name')
+    data['Description'] = first_text('span', 'component--field-formatter field-type-text_long ng-star-inserted')
+    data['Location'] = first_text('span', 'component--field-formatter field-type-identifier-multi')
+    data['Funding'] = first_text('a', 'cb-link component--field-formatter field-type-money ng-star-inserted')
+
+    if index.layout_identifier is not None:
+        data['Industry'] = text_of(index.layout_identifier)
+    if index.layout_date is not None:
+        data['Founding Date'] = text_of(index.layout_date)
+    if len(index.layout_enums) > 1:
+        data['Stage'] = index.layout_enums[1].get('title', '').strip()
+
+    website = index.find_first('a', 'component--field-formatter field-type-url ng-star-inserted')
+    if website is not None:
+        data['Website'] = website.get('href', '').strip()
+
+    for label in LABEL_VALUE_CLASSES:
+        value = index.label_value(label)
+        if value is not None:
+            data[label] = text_of(value)
+
+    for section_id, field in SECTION_FIELDS.items():
+        data[field] = ', '.join(index.section_links.get(section_id, []))
+    data['Social Media Profiles'] = ', '.join(index.social_links)
+
+    return data
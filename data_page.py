@@ -0,0 +1,42 @@
+import html
+import json
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+# YC pages are rendered by Inertia: the whole page payload is one HTML-encoded
+# JSON string in the data-page attribute of a single div. Building a full
+# BeautifulSoup tree just to read that attribute costs most of the CPU per page,
+# so we scan for the attribute directly and only fall back to a parse that is
+# restricted (with a SoupStrainer) to divs carrying data-page.
+
+DATA_PAGE_RE = re.compile(
+    r'<div\b[^>]*?\sdata-page\s*=\s*(?:"([^"]*)"|\'([^\']*)\')',
+    re.IGNORECASE | re.DOTALL,
+)
+
+DATA_PAGE_STRAINER = SoupStrainer('div', attrs={'data-page': True})
+
+# Function to return the raw (still HTML-encoded) data-page attribute value, or None
+def find_data_page_attr(html_content):
+    match = DATA_PAGE_RE.search(html_content)
+    if match:
+        return match.group(1) if match.group(1) is not None else match.group(2)
+
+    # Unusual markup (e.g. unquoted attribute): parse only the matching divs
+    soup = BeautifulSoup(html_content, "html.parser", parse_only=DATA_PAGE_STRAINER)
+    data_page_div = soup.find('div', attrs={'data-page': True})
+    if not data_page_div:
+        return None
+    # BeautifulSoup has already decoded the entities, encode them back so both
+    # paths return the attribute as it appears in the page
+    return html.escape(data_page_div['data-page'])
+
+# Function to extract and decode the data-page JSON from a page.
+# Returns None if the page has no data-page div; raises json.JSONDecodeError if
+# the payload is not valid JSON.
+def extract_data_page(html_content):
+    data_page_json_str = find_data_page_attr(html_content)
+    if data_page_json_str is None:
+        return None
+    # Unescape HTML entities and parse the JSON string
+    return json.loads(html.unescape(data_page_json_str))
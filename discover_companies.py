@@ -0,0 +1,212 @@
+import argparse
+import itertools
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from http_client import get_client, configure_client
+from discovery_frontier import DiscoveryFrontier, DEFAULT_FRONTIER_FILE
+from company_records import iter_company_records
+
+# Pure-Python replacement for scrape_yc_companies_urls.js.
+#
+# The YC directory page is a front end for an Algolia index. Instead of scrolling
+# the page in headless Chrome until it stops growing, we read the public search
+# key from the directory page and page through the index directly with the same
+# batch / industry / region filters. All pages after the first are fetched
+# concurrently (and so are the per-batch searches a large listing is split
+# into), and the result is written to filtered_company_urls.json.
+#
+# With --incremental, the listing is diffed against the frontier of earlier runs
+# (discovery_frontier.json) and only the newly listed companies are written, so
+# scrape_yc_companies.py only fetches the delta. Added and removed slugs, with the
+# time each was first seen, are written to --delta-output. Added slugs are written
+# again by every run until --ack reads them back from the scraped data, so a failed
+# scrape doesn't drop them from the delta.
+
+DIRECTORY_URL = "https://www.ycombinator.com/companies"
+COMPANY_URL_PREFIX = "https://www.ycombinator.com/companies/"
+ALGOLIA_INDEX = "YCCompany_production"
+# Algolia returns at most 1000 hits per search, so pages of 100 give up to 10
+# pages to fetch concurrently (a single page of 1000 would leave nothing to parallelize)
+HITS_PER_PAGE = 100
+
+# Same filters as the targetUrl in scrape_yc_companies_urls.js
+DEFAULT_BATCHES = ["Summer 2025", "Spring 2025", "Winter 2025", "Fall 2024", "Summer 2024", "Winter 2024"]
+DEFAULT_INDUSTRIES = ["Healthcare", "Engineering, Product and Design"]
+DEFAULT_REGIONS = ["United States of America", "United Kingdom", "France"]
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; DataExtractionBot/1.0)"
+}
+
+# Function to read the Algolia app id and search key embedded in the directory page
+def get_algolia_opts():
+    response = get_client().get(DIRECTORY_URL, headers=HEADERS)
+    if response.status_code != 200:
+        raise Exception(f"Failed to load directory page {DIRECTORY_URL} (Status code: {response.status_code})")
+    match = re.search(r'window\.AlgoliaOpts\s*=\s*(\{.*?\})', response.text)
+    if not match:
+        raise Exception("Couldn't find the Algolia options in the directory page.")
+    opts = json.loads(match.group(1))
+    return opts["app"], opts["key"]
+
+def build_facet_filters(batches, industries, regions):
+    # Values inside one list are OR-ed, the lists are AND-ed (like the directory UI)
+    facet_filters = []
+    if batches:
+        facet_filters.append([f"batch:{batch}" for batch in batches])
+    if industries:
+        facet_filters.append([f"industries:{industry}" for industry in industries])
+    if regions:
+        facet_filters.append([f"regions:{region}" for region in regions])
+    return facet_filters
+
+class DirectorySearch:
+    def __init__(self, app_id, api_key, index=ALGOLIA_INDEX):
+        self.url = f"https://{app_id.lower()}-dsn.algolia.net/1/indexes/*/queries"
+        self.headers = {
+            **HEADERS,
+            "x-algolia-application-id": app_id,
+            "x-algolia-api-key": api_key,
+        }
+        self.index = index
+
+    def query(self, facet_filters, page=0, facets=None):
+        params = {
+            "query": "",
+            "hitsPerPage": HITS_PER_PAGE,
+            "page": page,
+            "facetFilters": json.dumps(facet_filters),
+            "attributesToRetrieve": json.dumps(["slug"]),
+        }
+        if facets:
+            params["facets"] = json.dumps(facets)
+        body = {"requests": [{"indexName": self.index, "params": urlencode(params)}]}
+        response = get_client().post(self.url, headers=self.headers, json=body)
+        if response.status_code != 200:
+            raise Exception(f"Directory search failed on page {page} (Status code: {response.status_code})")
+        return response.json()["results"][0]
+
+    def iter_slugs(self, facet_filters, workers=8):
+        """
+        Yield the slugs of every company matching facet_filters as each result
+        page arrives, paging concurrently. A slug may be yielded more than once.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            first = self.query(facet_filters, page=0, facets=["batch"])
+            count = 0
+            for slug in self._page_slugs(executor, facet_filters, first):
+                count += 1
+                yield slug
+
+            # Algolia stops paginating after a fixed number of hits. If the filters match
+            # more than that, split the search per batch (each batch is far smaller) and
+            # query the batches concurrently.
+            has_batch_filter = any(value.startswith("batch:") for group in facet_filters for value in group)
+            if count < first["nbHits"] and not has_batch_filter:
+                batch_filters = [facet_filters + [[f"batch:{batch}"]] for batch in first.get("facets", {}).get("batch", {})]
+                firsts = executor.map(lambda filters: self.query(filters, page=0), batch_filters)
+                for filters, batch_first in zip(batch_filters, firsts):
+                    yield from self._page_slugs(executor, filters, batch_first)
+
+    def _page_slugs(self, executor, facet_filters, first):
+        # Slugs of the first result page, then of the remaining pages fetched concurrently
+        results = [first]
+        if first["nbPages"] > 1:
+            results = itertools.chain(results, executor.map(lambda page: self.query(facet_filters, page),
+                                                            range(1, first["nbPages"])))
+        for result in results:
+            for hit in result["hits"]:
+                if hit.get("slug"):
+                    yield hit["slug"]
+
+    def slugs(self, facet_filters, workers=8):
+        """
+        Return the slugs of every company matching facet_filters, paging concurrently.
+        """
+        return list(self.iter_slugs(facet_filters, workers))
+
+def iter_company_slugs(batches, industries, regions, workers=8, app_id=None, api_key=None):
+    """
+    Yield each matching company slug once, as soon as its result page arrives.
+    """
+    if not (app_id and api_key):
+        app_id, api_key = get_algolia_opts()
+    search = DirectorySearch(app_id, api_key)
+    seen = set()
+    for slug in search.iter_slugs(build_facet_filters(batches, industries, regions), workers):
+        if slug not in seen:
+            seen.add(slug)
+            yield slug
+
+def discover_company_slugs(batches, industries, regions, workers=8, app_id=None, api_key=None):
+    # Duplicates are removed in one pass, keeping the directory order
+    return list(iter_company_slugs(batches, industries, regions, workers, app_id, api_key))
+
+def discover_company_urls(batches, industries, regions, workers=8, app_id=None, api_key=None):
+    return [COMPANY_URL_PREFIX + slug for slug in discover_company_slugs(batches, industries, regions, workers, app_id, api_key)]
+
+def frontier_key(batches, industries, regions):
+    # Listings with different filters are tracked separately in the frontier
+    return json.dumps(build_facet_filters(sorted(batches), sorted(industries), sorted(regions)))
+
+def main():
+    parser = argparse.ArgumentParser(description="List YC company URLs from the directory without a browser")
+    parser.add_argument("--batch", action="append", help="Batch filter, repeatable (default: the batches in scrape_yc_companies_urls.js)")
+    parser.add_argument("--industry", action="append", help="Industry filter, repeatable")
+    parser.add_argument("--region", action="append", help="Region filter, repeatable")
+    parser.add_argument("--all", action="store_true", help="Ignore the default filters and list the whole directory")
+    parser.add_argument("--workers", type=int, default=8, help="Pages fetched at the same time (default: 8)")
+    parser.add_argument("--output", default='filtered_company_urls.json')
+    parser.add_argument("--algolia-app", help="Algolia app id (default: read from the directory page)")
+    parser.add_argument("--algolia-key", help="Algolia search key (default: read from the directory page)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only write companies not listed in earlier runs (tracked in --frontier)")
+    parser.add_argument("--frontier", default=DEFAULT_FRONTIER_FILE,
+                        help=f"Seen-slug store used by --incremental (default: {DEFAULT_FRONTIER_FILE})")
+    parser.add_argument("--delta-output", default='company_url_delta.json',
+                        help="Where --incremental writes the added and removed slugs (default: company_url_delta.json)")
+    parser.add_argument("--ack", nargs="?", const='yc_companies_data.json', default=None,
+                        help="Mark the companies in this scraped data (.json, .jsonl or .db) as done in --frontier "
+                             "and exit (default file: yc_companies_data.json)")
+    args = parser.parse_args()
+
+    if args.ack:
+        frontier = DiscoveryFrontier(args.frontier)
+        acknowledged = frontier.ack(company.get('slug') for company in iter_company_records(args.ack))
+        frontier.save()
+        print(f"{acknowledged} pending companies in '{args.ack}' marked as scraped in '{args.frontier}'.")
+        return
+
+    defaults = not args.all
+    batches = args.batch or (DEFAULT_BATCHES if defaults else [])
+    industries = args.industry or (DEFAULT_INDUSTRIES if defaults else [])
+    regions = args.region or (DEFAULT_REGIONS if defaults else [])
+
+    client = configure_client(pool_size=args.workers)
+    slugs = discover_company_slugs(batches, industries, regions, args.workers, args.algolia_app, args.algolia_key)
+    print(f"Found {len(slugs)} filtered companies.")
+    print(f"Connections: {client.summary()}")
+    client.close()
+
+    if args.incremental:
+        frontier = DiscoveryFrontier(args.frontier)
+        added, removed = frontier.update(frontier_key(batches, industries, regions), slugs)
+        frontier.save()
+        for entry in added:
+            entry["url"] = COMPANY_URL_PREFIX + entry["slug"]
+        with open(args.delta_output, 'w', encoding='utf-8') as f:
+            json.dump({"added": added, "removed": removed}, f, indent=2)
+        print(f"{len(added)} added (or not yet scraped) and {len(removed)} removed since the last run "
+              f"(details in '{args.delta_output}'). Run with --ack once they are scraped.")
+        slugs = [entry["slug"] for entry in added]
+
+    company_urls = [COMPANY_URL_PREFIX + slug for slug in slugs]
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(company_urls, f, indent=2)
+    print(f"Filtered company URLs have been saved to '{args.output}'.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import json
+import os
+from datetime import datetime, timezone
+
+# Persistent seen-slug frontier for incremental discovery.
+#
+# Each discovery run is diffed against the slugs seen by earlier runs with the
+# same filters. Only the slugs that were added or removed since the last run are
+# emitted, so the detail scraper only touches what changed. Every slug keeps the
+# time it was first seen; removed slugs are kept (with removed_at) so a company
+# that comes back keeps its original first_seen.
+#
+# Added slugs stay pending until ack() is called with the slugs that were actually
+# scraped, and every run re-emits the pending ones that are still listed, so a
+# scrape that fails or never runs doesn't lose them.
+
+DEFAULT_FRONTIER_FILE = 'discovery_frontier.json'
+
+def now_iso():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class DiscoveryFrontier:
+    def __init__(self, path=DEFAULT_FRONTIER_FILE):
+        self.path = path
+        self.data = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+
+    def update(self, filters_key, slugs):
+        """
+        Record the slugs of the current listing for filters_key and return
+        (added, removed) lists of {"slug", "first_seen", ...} dicts. Added
+        includes listed slugs from earlier runs that haven't been acknowledged.
+        """
+        seen = self.data.setdefault(filters_key, {})
+        timestamp = now_iso()
+        current = set(slugs)
+
+        added = []
+        for slug in dict.fromkeys(slugs):
+            entry = seen.get(slug)
+            if entry is None:
+                entry = seen[slug] = {"first_seen": timestamp, "last_seen": timestamp, "removed_at": None,
+                                      "pending": True}
+            elif entry["removed_at"] is not None:
+                # Listed again after being removed
+                entry["removed_at"] = None
+                entry["pending"] = True
+            # Entries from before pending was tracked were already emitted
+            if entry.get("pending"):
+                added.append({"slug": slug, "first_seen": entry["first_seen"]})
+            entry["last_seen"] = timestamp
+
+        removed = []
+        for slug, entry in seen.items():
+            if slug not in current and entry["removed_at"] is None:
+                entry["removed_at"] = timestamp
+                removed.append({"slug": slug, "first_seen": entry["first_seen"], "removed_at": timestamp})
+
+        return added, removed
+
+    def ack(self, slugs):
+        """
+        Mark pending slugs as scraped in every filter set and return how many were pending.
+        """
+        slugs = set(slugs)
+        acknowledged = 0
+        for seen in self.data.values():
+            for slug in slugs & seen.keys():
+                if seen[slug].get("pending"):
+                    seen[slug]["pending"] = False
+                    acknowledged += 1
+        return acknowledged
+
+    def save(self):
+        # Write to a temporary file first so a crash never leaves a truncated frontier
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,248 @@
+import argparse
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from company_records import iter_company_records, JsonlWriter
+from crunchbase_join import iter_crunchbase_rows, registrable_domain
+
+# Blocked fuzzy matching of YC companies to Crunchbase organizations by name.
+#
+# Comparing every YC company with every organization is quadratic. Instead, the
+# Crunchbase rows are indexed by blocking keys and only pairs that share a block
+# are scored:
+#   - name block: character trigrams of the normalized name (legal suffixes,
+#     generic words like 'Labs' and punctuation removed), in an inverted index
+#   - domain block: registrable domain of the website
+#   - country: pairs whose countries are both known and differ are never scored
+# Name blocks use a prefix filter with a count check: every trigram is indexed,
+# but a lookup only probes the name's rarest trigrams. A name with trigram
+# Jaccard similarity t or more shares at least ceil(t * g) of the g trigrams, so
+# among the g - ceil(t * g) + 1 + PROBE_EXTRA rarest it shares at least
+# 1 + PROBE_EXTRA, and rows with fewer hits are never scored. Common trigrams
+# like ' ai' are rarely probed, and a lookup touches a handful of rows instead of
+# the whole index.
+
+NGRAM_SIZE = 3
+DEFAULT_THRESHOLD = 0.6  # Minimum score for a match
+DOMAIN_BONUS = 0.4  # Added to the name score when the registrable domains match
+PROBE_EXTRA = 2  # Grams probed beyond the prefix; each one raises the hits a candidate needs
+
+DEFAULT_MATCHES_FILE = 'yc_crunchbase_matches.jsonl'
+
+# Dropped from names before comparing, so 'Acme Inc.' and 'Acme' are the same company
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+    'gmbh', 'ag', 'sa', 'sas', 'srl', 'bv', 'plc', 'pte', 'pty', 'oy', 'ab', 'as',
+}
+
+# Industry words that many unrelated names share ('Acme Labs', 'Nova Labs'). They are
+# left out of the compared name, so 'Acme' and 'Acme AI' match and generic words
+# don't make every '... Labs' a candidate for every other one
+GENERIC_WORDS = {
+    'ai', 'labs', 'lab', 'health', 'healthcare', 'technologies', 'technology', 'tech', 'systems',
+    'software', 'robotics', 'security', 'solutions', 'ventures', 'group', 'global', 'hq', 'app',
+    'the', 'and',
+}
+
+# Country names in Crunchbase locations -> the ISO codes used by the YC directory
+COUNTRY_CODES = {
+    'united states': 'US', 'usa': 'US', 'canada': 'CA', 'mexico': 'MX', 'brazil': 'BR',
+    'argentina': 'AR', 'colombia': 'CO', 'chile': 'CL', 'united kingdom': 'GB', 'england': 'GB',
+    'ireland': 'IE', 'france': 'FR', 'germany': 'DE', 'netherlands': 'NL', 'the netherlands': 'NL',
+    'belgium': 'BE', 'switzerland': 'CH', 'spain': 'ES', 'portugal': 'PT', 'italy': 'IT',
+    'sweden': 'SE', 'norway': 'NO', 'denmark': 'DK', 'finland': 'FI', 'estonia': 'EE',
+    'poland': 'PL', 'austria': 'AT', 'israel': 'IL', 'turkey': 'TR', 'united arab emirates': 'AE',
+    'egypt': 'EG', 'nigeria': 'NG', 'kenya': 'KE', 'south africa': 'ZA', 'india': 'IN',
+    'pakistan': 'PK', 'singapore': 'SG', 'indonesia': 'ID', 'philippines': 'PH', 'vietnam': 'VN',
+    'china': 'CN', 'hong kong': 'HK', 'taiwan': 'TW', 'japan': 'JP', 'south korea': 'KR',
+    'australia': 'AU', 'new zealand': 'NZ',
+}
+
+# Crunchbase columns read by the resolver: the API scraper's and cb.py's names.
+# The API scraper's 'Headquarters Location' is only a region, so its country
+# comes from 'Headquarters Country'
+CRUNCHBASE_NAME_COLUMNS = ['Organization Name', 'Name']
+CRUNCHBASE_COUNTRY_COLUMNS = ['Headquarters Country']
+CRUNCHBASE_LOCATION_COLUMNS = ['Location', 'Headquarters Address', 'Headquarters Location']
+
+def normalize_name(name):
+    """
+    Lowercase ASCII words of a company name, without punctuation or legal suffixes.
+    """
+    name = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii').lower()
+    words = re.sub(r'[^a-z0-9]+', ' ', name.replace('&', ' and ')).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def name_key(name):
+    """
+    Normalized name without generic words, or the whole normalized name if
+    it only has generic words ('AI Labs').
+    """
+    normalized = normalize_name(name)
+    words = [word for word in normalized.split() if word not in GENERIC_WORDS]
+    return ' '.join(words) or normalized
+
+def name_ngrams(key, size=NGRAM_SIZE):
+    # Padded with spaces so short names and word boundaries still produce grams
+    padded = f' {key} '
+    return {padded[i:i + size] for i in range(max(1, len(padded) - size + 1))}
+
+def country_code(location):
+    """
+    ISO code of the country at the end of a Crunchbase location, or None.
+    """
+    if not location:
+        return None
+    last = location.rsplit(',', 1)[-1].strip().lower()
+    return COUNTRY_CODES.get(last)
+
+def first_value(row, columns):
+    for column in columns:
+        if row.get(column):
+            return row[column]
+    return None
+
+class ResolverIndex:
+    """
+    Blocking index over Crunchbase rows. Only candidate pairs that share a
+    block are ever scored.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.rows = []
+        self.grams = []
+        self.domains = []
+        self.countries = []
+        self.by_domain = {}
+        self.by_gram = None
+        self.pairs_scored = 0
+
+    def add(self, row):
+        position = len(self.rows)
+        domain = registrable_domain(row.get('Website'))
+        self.rows.append(row)
+        self.grams.append(name_ngrams(name_key(first_value(row, CRUNCHBASE_NAME_COLUMNS))))
+        self.domains.append(domain)
+        self.countries.append(country_code(first_value(row, CRUNCHBASE_COUNTRY_COLUMNS))
+                              or country_code(first_value(row, CRUNCHBASE_LOCATION_COLUMNS)))
+        if domain:
+            self.by_domain.setdefault(domain, []).append(position)
+        # Name blocks are built on the first lookup, after all rows are loaded
+        self.by_gram = None
+
+    def load(self, path):
+        for row in iter_crunchbase_rows(path):
+            self.add(row)
+
+    def build_name_blocks(self):
+        self.by_gram = {}
+        for position, grams in enumerate(self.grams):
+            for gram in grams:
+                self.by_gram.setdefault(gram, []).append(position)
+
+    def candidates(self, grams, domain):
+        if self.by_gram is None:
+            self.build_name_blocks()
+        candidates = set(self.by_domain.get(domain, ())) if domain else set()
+        if grams:
+            # A name at the threshold shares at least 'needed' grams, so at most
+            # len(grams) - needed grams are unshared: among the 'probe' rarest grams
+            # it shares at least probe - (len(grams) - needed)
+            needed = math.ceil(self.threshold * len(grams))
+            probe = min(len(grams), len(grams) - needed + 1 + PROBE_EXTRA)
+            min_hits = probe - (len(grams) - needed)
+            rarest = sorted(grams, key=lambda gram: len(self.by_gram.get(gram, ())))[:probe]
+            hits = Counter()
+            for gram in rarest:
+                hits.update(self.by_gram.get(gram, ()))
+            candidates.update([position for position, count in hits.items() if count >= min_hits])
+        return candidates
+
+    def score(self, grams, domain, position):
+        other = self.grams[position]
+        shared = len(grams & other)
+        union = len(grams) + len(other) - shared
+        score = shared / union if union else 0.0
+        if domain and domain == self.domains[position]:
+            score += DOMAIN_BONUS
+        return min(score, 1.0)
+
+    def resolve(self, name, website=None, country=None):
+        """
+        Return (row, score) of the best scoring Crunchbase row for a company,
+        or (None, best score) when nothing reaches the threshold.
+        """
+        grams = name_ngrams(name_key(name)) if name else set()
+        domain = registrable_domain(website)
+        best, best_score = None, 0.0
+        # Names of very different lengths can't reach the threshold on name alone
+        min_size, max_size = self.threshold * len(grams), len(grams) / self.threshold
+        for position in self.candidates(grams, domain):
+            other_country = self.countries[position]
+            if country and other_country and country != other_country:
+                continue
+            if not min_size <= len(self.grams[position]) <= max_size and not (domain and self.domains[position] == domain):
+                continue
+            self.pairs_scored += 1
+            score = self.score(grams, domain, position)
+            # Ties go to the row added last, which is the most recent for appended sinks
+            if score > best_score or (score == best_score and best is not None and position > best):
+                best, best_score = position, score
+        if best is None or best_score < self.threshold:
+            return None, best_score
+        return self.rows[best], best_score
+
+    def resolve_company(self, company):
+        return self.resolve(company.get('name'), company.get('website'),
+                            company.get('key_details', {}).get('country'))
+
+def main():
+    parser = argparse.ArgumentParser(description="Match YC companies to Crunchbase organizations by name, domain and country")
+    parser.add_argument("input", nargs="?", default='yc_companies_data.json',
+                        help="YC companies (.json, .jsonl or .db, default: yc_companies_data.json)")
+    parser.add_argument("--crunchbase", action="append", required=True,
+                        help="Crunchbase data: the API scraper's CSV, .db or Parquet output, or cb.py's CSV. Repeatable")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum match score between 0 and 1 (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--output", default=DEFAULT_MATCHES_FILE,
+                        help=f"One line per YC company with its match and score (default: {DEFAULT_MATCHES_FILE})")
+    args = parser.parse_args()
+
+    index = ResolverIndex(args.threshold)
+    for path in args.crunchbase:
+        index.load(path)
+    index.build_name_blocks()
+    print(f"Indexed {len(index.rows)} Crunchbase rows in {len(index.by_gram)} name blocks "
+          f"and {len(index.by_domain)} domain blocks.")
+
+    # The matches file is rewritten on every run
+    if os.path.exists(args.output):
+        os.remove(args.output)
+    matched = Counter()
+    writer = JsonlWriter(args.output)
+    try:
+        for company in iter_company_records(args.input):
+            row, score = index.resolve_company(company)
+            matched[row is not None] += 1
+            writer.write({
+                "name": company.get('name'),
+                "website": company.get('website'),
+                "crunchbase": row,
+                "score": round(score, 3),
+            })
+    finally:
+        writer.close()
+
+    total = matched[True] + matched[False]
+    rate = matched[True] / total * 100 if total else 0
+    print(f"Matched {matched[True]}/{total} companies ({rate:.1f}%) after scoring {index.pairs_scored} candidate pairs "
+          f"(all pairs: {total * len(index.rows)}).")
+    print(f"Matches written to '{args.output}'.")
+
+if __name__ == "__main__":
+    main()
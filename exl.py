@@ -1,35 +1,20 @@
-import json
-import pandas as pd
-from openpyxl import load_workbook
+import argparse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 import os
+from company_records import iter_company_records
 
-# Load the JSON data
-with open('yc_companies_data.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+parser = argparse.ArgumentParser(description="Export YC founders with social links to Excel")
+parser.add_argument("input", nargs="?", default='yc_companies_data.json',
+                    help="yc_companies_data.json, a .jsonl file or a .db SQLite store")
+parser.add_argument("--batch", help="Only export companies from this batch, e.g. 'Summer 2025'")
+parser.add_argument("--country", help="Only export companies from this country code, e.g. 'US'")
+parser.add_argument("--year", type=int, help="Only export companies founded in this year")
+args = parser.parse_args()
 
-# Extract required fields
-rows = []
-for company in data:
-    company_name = company.get("name")
-    website = company.get("website")
-    linkedin_company = company.get("social_media", {}).get("linkedin")
-
-    for founder in company.get("founders", []):
-        founder_name = founder.get("full_name")
-        founder_linkedin = founder.get("social_links", {}).get("linkedin")
-        founder_twitter = founder.get("social_links", {}).get("twitter")
-
-        rows.append({
-            "Company Name": company_name,
-            "Website": website,
-            "LinkedIn (Company)": linkedin_company,
-            "Founder Name": founder_name,
-            "Founder LinkedIn": founder_linkedin,
-            "Founder Twitter": founder_twitter
-        })
-
-# Convert to DataFrame
-df = pd.DataFrame(rows)
+# Stream the company records (.json, .jsonl or .db; filters are indexed queries on .db)
+data = iter_company_records(args.input, batch_name=args.batch, country=args.country, year_founded=args.year)
 
 # Define filename
 excel_filename = 'yc_companies_filtered.xlsx'
@@ -42,14 +27,12 @@ if os.path.exists(excel_filename):
         print(f"⚠️ Please close '{excel_filename}' and run the script again.")
         exit()
 
-# Save to Excel
-df.to_excel(excel_filename, index=False)
-
-# Adjust column widths
-wb = load_workbook(excel_filename)
-ws = wb.active
+# Write-only workbook: rows are streamed straight to the file in a single pass,
+# so memory stays flat no matter how many founders are exported
+wb = Workbook(write_only=True)
+ws = wb.create_sheet()
 
-# Set reasonable column widths for readability
+# Set reasonable column widths for readability (must be set before any row is written)
 column_widths = {
     'A': 30,  # Company Name
     'B': 45,  # Website
@@ -62,6 +45,28 @@ column_widths = {
 for col, width in column_widths.items():
     ws.column_dimensions[col].width = width
 
+# Header row, bold like the pandas export it replaces
+headers = ["Company Name", "Website", "LinkedIn (Company)", "Founder Name", "Founder LinkedIn", "Founder Twitter"]
+header_cells = []
+for header in headers:
+    cell = WriteOnlyCell(ws, value=header)
+    cell.font = Font(bold=True)
+    header_cells.append(cell)
+ws.append(header_cells)
+
+# Extract required fields, one row per founder
+for company in data:
+    company_name = company.get("name")
+    website = company.get("website")
+    linkedin_company = company.get("social_media", {}).get("linkedin")
+
+    for founder in company.get("founders", []):
+        founder_name = founder.get("full_name")
+        founder_linkedin = founder.get("social_links", {}).get("linkedin")
+        founder_twitter = founder.get("social_links", {}).get("twitter")
+
+        ws.append([company_name, website, linkedin_company, founder_name, founder_linkedin, founder_twitter])
+
 wb.save(excel_filename)
 
 print(f" Excel file '{excel_filename}' created successfully with founder social links.")
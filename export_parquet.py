@@ -0,0 +1,180 @@
+import argparse
+import os
+import shutil
+import pyarrow as pa
+import pyarrow.dataset as ds
+from company_records import iter_company_records
+from company_store import company_slug
+
+# Columnar export of the YC dataset.
+#
+# Writes three Parquet datasets under the output directory, each partitioned by
+# batch_name (hive style, e.g. companies/batch_name=Summer 2025/...):
+#   companies/  one row per company (key_details and social_media flattened)
+#   founders/   one row per founder, joined to companies on company_slug
+#   news/       one row per latest_news item, joined to companies on company_slug
+#
+# Input is streamed and written in chunks of --chunk-size companies, so memory
+# stays bounded by the chunk and not by the dataset.
+
+COMPANIES_SCHEMA = pa.schema([
+    ('slug', pa.string()),
+    ('name', pa.string()),
+    ('one_liner', pa.string()),
+    ('website', pa.string()),
+    ('long_description', pa.string()),
+    ('mission', pa.string()),
+    ('batch_name', pa.string()),
+    ('year_founded', pa.int32()),
+    ('team_size', pa.int32()),
+    ('location', pa.string()),
+    ('city', pa.string()),
+    ('country', pa.string()),
+    ('linkedin', pa.string()),
+    ('twitter', pa.string()),
+    ('facebook', pa.string()),
+    ('crunchbase', pa.string()),
+    ('num_founders', pa.int32()),
+    ('num_news', pa.int32()),
+])
+
+FOUNDERS_SCHEMA = pa.schema([
+    ('company_slug', pa.string()),
+    ('batch_name', pa.string()),
+    ('position', pa.int32()),
+    ('full_name', pa.string()),
+    ('title', pa.string()),
+    ('bio', pa.string()),
+    ('twitter', pa.string()),
+    ('linkedin', pa.string()),
+])
+
+NEWS_SCHEMA = pa.schema([
+    ('company_slug', pa.string()),
+    ('batch_name', pa.string()),
+    ('position', pa.int32()),
+    ('title', pa.string()),
+    ('url', pa.string()),
+    ('date', pa.string()),
+])
+
+TABLES = {
+    'companies': COMPANIES_SCHEMA,
+    'founders': FOUNDERS_SCHEMA,
+    'news': NEWS_SCHEMA,
+}
+
+def company_rows(company):
+    """
+    Return the (company_row, founder_rows, news_rows) dicts for one record.
+    """
+    slug = company_slug(company)
+    key_details = company.get('key_details', {})
+    social_media = company.get('social_media', {})
+    founders = company.get('founders', [])
+    news = company.get('latest_news', [])
+    batch_name = key_details.get('batch_name')
+
+    company_row = {
+        'slug': slug,
+        'name': company.get('name'),
+        'one_liner': company.get('one_liner'),
+        'website': company.get('website'),
+        'long_description': company.get('long_description'),
+        'mission': company.get('mission'),
+        'batch_name': batch_name,
+        'year_founded': key_details.get('year_founded'),
+        'team_size': key_details.get('team_size'),
+        'location': key_details.get('location'),
+        'city': key_details.get('city'),
+        'country': key_details.get('country'),
+        'linkedin': social_media.get('linkedin'),
+        'twitter': social_media.get('twitter'),
+        'facebook': social_media.get('facebook'),
+        'crunchbase': social_media.get('crunchbase'),
+        'num_founders': len(founders),
+        'num_news': len(news),
+    }
+    founder_rows = [
+        {
+            'company_slug': slug,
+            'batch_name': batch_name,
+            'position': position,
+            'full_name': founder.get('full_name'),
+            'title': founder.get('title'),
+            'bio': founder.get('bio'),
+            'twitter': founder.get('social_links', {}).get('twitter'),
+            'linkedin': founder.get('social_links', {}).get('linkedin'),
+        }
+        for position, founder in enumerate(founders)
+    ]
+    news_rows = [
+        {
+            'company_slug': slug,
+            'batch_name': batch_name,
+            'position': position,
+            'title': item.get('title'),
+            'url': item.get('url'),
+            'date': item.get('date'),
+        }
+        for position, item in enumerate(news)
+    ]
+    return company_row, founder_rows, news_rows
+
+def write_chunk(output_dir, chunk_index, rows_by_table, compression):
+    partitioning = ds.partitioning(pa.schema([('batch_name', pa.string())]), flavor='hive')
+    file_options = ds.ParquetFileFormat().make_write_options(compression=compression)
+    for table_name, schema in TABLES.items():
+        rows = rows_by_table[table_name]
+        if not rows:
+            continue
+        ds.write_dataset(
+            pa.Table.from_pylist(rows, schema=schema),
+            os.path.join(output_dir, table_name),
+            format='parquet',
+            partitioning=partitioning,
+            file_options=file_options,
+            basename_template=f'part-{chunk_index}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+        )
+
+def export_parquet(input_path, output_dir, chunk_size=10000, compression='zstd'):
+    """
+    Export companies, founders and news to partitioned Parquet datasets.
+    Returns the number of companies written.
+    """
+    # Start from empty datasets so stale partitions from an earlier export don't linger
+    for table_name in TABLES:
+        shutil.rmtree(os.path.join(output_dir, table_name), ignore_errors=True)
+
+    rows_by_table = {table_name: [] for table_name in TABLES}
+    chunk_index = 0
+    count = 0
+    for company in iter_company_records(input_path):
+        company_row, founder_rows, news_rows = company_rows(company)
+        rows_by_table['companies'].append(company_row)
+        rows_by_table['founders'].extend(founder_rows)
+        rows_by_table['news'].extend(news_rows)
+        count += 1
+        if len(rows_by_table['companies']) >= chunk_size:
+            write_chunk(output_dir, chunk_index, rows_by_table, compression)
+            rows_by_table = {table_name: [] for table_name in TABLES}
+            chunk_index += 1
+    write_chunk(output_dir, chunk_index, rows_by_table, compression)
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the YC dataset to Parquet, partitioned by batch")
+    parser.add_argument("input", nargs="?", default='yc_companies_data.json',
+                        help="yc_companies_data.json, a .jsonl file or a .db SQLite store")
+    parser.add_argument("--output-dir", default='yc_companies_parquet')
+    parser.add_argument("--compression", default='zstd', choices=['zstd', 'snappy', 'gzip', 'none'])
+    parser.add_argument("--chunk-size", type=int, default=10000,
+                        help="Companies buffered before each write (default: 10000)")
+    args = parser.parse_args()
+
+    count = export_parquet(args.input, args.output_dir, args.chunk_size, args.compression)
+    print(f"Exported {count} companies to '{args.output_dir}' (companies, founders, news).")
+
+if __name__ == "__main__":
+    main()
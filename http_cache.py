@@ -0,0 +1,180 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+# Persistent HTTP response cache.
+#
+# Bodies are stored content-addressed under <cache_dir>/bodies/<sha256>, so the
+# same body fetched from several URLs is kept once. A small SQLite index maps
+# each URL to its body hash together with the ETag / Last-Modified validators.
+#
+# Within 'ttl' seconds a cached response is served straight from disk. After
+# that it is revalidated with If-None-Match / If-Modified-Since, and a 304 just
+# refreshes the entry. When the bodies exceed 'max_bytes' the least recently
+# used entries are evicted.
+
+DEFAULT_CACHE_DIR = '.http_cache'
+DEFAULT_TTL = 24 * 60 * 60  # One day
+DEFAULT_NEWS_TTL = 6 * 60 * 60  # newsUrl responses change more often than company pages
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+class ResponseCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.bodies_dir = os.path.join(cache_dir, 'bodies')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(self.bodies_dir, exist_ok=True)
+
+        self.db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite3'))
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_entries_body_hash ON entries (body_hash)')
+        self.db.commit()
+        self.total_bytes = self._stored_bytes()
+
+        # Counters for the end-of-run summary
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.network_requests = 0
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.bodies_dir, body_hash)
+
+    def _lookup(self, url):
+        row = self.db.execute(
+            'SELECT body_hash, etag, last_modified, fetched_at FROM entries WHERE url = ?', (url,)
+        ).fetchone()
+        if row and not os.path.exists(self._body_path(row[0])):
+            # Body was removed from disk behind our back, treat as a miss
+            self.db.execute('DELETE FROM entries WHERE url = ?', (url,))
+            self.db.commit()
+            return None
+        return row
+
+    def _read_body(self, body_hash):
+        with open(self._body_path(body_hash), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def _touch(self, url, refetched=False):
+        now = time.time()
+        if refetched:
+            self.db.execute('UPDATE entries SET fetched_at = ?, last_used = ? WHERE url = ?', (now, now, url))
+        else:
+            self.db.execute('UPDATE entries SET last_used = ? WHERE url = ?', (now, url))
+        self.db.commit()
+
+    def fresh_body(self, url):
+        """
+        Return the cached body for url if it is still within the TTL, else None.
+        """
+        row = self._lookup(url)
+        if row and time.time() - row[3] < self.ttl:
+            self.hits += 1
+            self._touch(url)
+            return self._read_body(row[0])
+        return None
+
+    def conditional_headers(self, url):
+        """
+        Return the If-None-Match / If-Modified-Since headers for a stale entry.
+        """
+        row = self._lookup(url)
+        headers = {}
+        if row:
+            if row[1]:
+                headers['If-None-Match'] = row[1]
+            if row[2]:
+                headers['If-Modified-Since'] = row[2]
+        return headers
+
+    def handle_response(self, url, status, text, response_headers):
+        """
+        Store a 200 response or resolve a 304 against the cache.
+        Returns the (status, text) pair the caller should use.
+        """
+        self.network_requests += 1
+        if status == 304:
+            row = self._lookup(url)
+            if row:
+                self.revalidated += 1
+                self._touch(url, refetched=True)
+                return 200, self._read_body(row[0])
+            return status, text
+
+        if status == 200:
+            self.misses += 1
+            self.store(url, text, response_headers.get('ETag'), response_headers.get('Last-Modified'))
+        return status, text
+
+    def store(self, url, text, etag=None, last_modified=None):
+        body = text.encode('utf-8')
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._body_path(body_hash)
+        if not os.path.exists(path):
+            # Write to a temporary file first so a crash never leaves a truncated body
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+            self.total_bytes += len(body)
+
+        old = self.db.execute('SELECT body_hash FROM entries WHERE url = ?', (url,)).fetchone()
+        now = time.time()
+        self.db.execute(
+            'INSERT OR REPLACE INTO entries (url, body_hash, size, etag, last_modified, fetched_at, last_used) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (url, body_hash, len(body), etag, last_modified, now, now)
+        )
+        self.db.commit()
+        if old and old[0] != body_hash:
+            self._remove_body_if_unused(old[0])
+        self.evict()
+
+    def _remove_body_if_unused(self, body_hash):
+        in_use = self.db.execute('SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1', (body_hash,)).fetchone()
+        if in_use:
+            return
+        path = self._body_path(body_hash)
+        if os.path.exists(path):
+            self.total_bytes -= os.path.getsize(path)
+            os.remove(path)
+
+    def _stored_bytes(self):
+        # Bodies shared by several URLs are only counted once
+        row = self.db.execute(
+            'SELECT SUM(size) FROM (SELECT body_hash, MAX(size) AS size FROM entries GROUP BY body_hash)'
+        ).fetchone()
+        return row[0] or 0
+
+    def evict(self):
+        """
+        Drop least recently used entries until the bodies fit in max_bytes.
+        """
+        if not self.max_bytes or self.total_bytes <= self.max_bytes:
+            return
+        rows = self.db.execute('SELECT url, body_hash FROM entries ORDER BY last_used').fetchall()
+        for url, body_hash in rows:
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.db.execute('DELETE FROM entries WHERE url = ?', (url,))
+            self._remove_body_if_unused(body_hash)
+        self.db.commit()
+
+    def summary(self):
+        return f"{self.hits} fresh hits, {self.revalidated} revalidated (304), {self.misses} downloaded"
+
+    def close(self):
+        self.db.close()
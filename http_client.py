@@ -0,0 +1,137 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# httpx is only needed for HTTP/2
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Shared HTTP client for all scrapers.
+#
+# Calling the module-level requests.get opens a new TCP + TLS connection for every
+# request. A single long-lived client keeps connections to each host alive in a
+# pool and reuses them, and with http2=True (httpx + h2) multiplexes concurrent
+# requests over one connection per host. Connection stats show how many requests
+# actually reused a connection.
+
+DEFAULT_POOL_SIZE = 10
+
+# Exceptions a request can raise with either backend
+REQUEST_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+class HttpClient:
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, http2=False):
+        self.http2 = http2
+        self.requests = 0
+        self.new_connections = 0
+        self.lock = threading.Lock()
+
+        if http2:
+            if httpx is None:
+                raise RuntimeError("HTTP/2 needs httpx with h2: pip install 'httpx[http2]'")
+            limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            self.session = httpx.Client(http2=True, limits=limits, follow_redirects=True)
+        else:
+            self.session = requests.Session()
+            # One pool per host, each keeping up to pool_size connections alive
+            self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount('https://', self.adapter)
+            self.session.mount('http://', self.adapter)
+
+    def _trace(self, event_name, info):
+        # httpcore reports each new TCP connection; reused ones skip this event
+        if event_name == 'connection.connect_tcp.complete':
+            with self.lock:
+                self.new_connections += 1
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.requests += 1
+        if self.http2:
+            return self.session.request(method, url, extensions={'trace': self._trace}, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def connection_count(self):
+        if self.http2:
+            return self.new_connections
+        # urllib3 counts the connections each host pool has opened
+        pools = self.adapter.poolmanager.pools
+        total = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                total += pool.num_connections
+        return total
+
+    def stats(self):
+        connections = self.connection_count()
+        return {
+            'requests': self.requests,
+            'connections_opened': connections,
+            'connections_reused': max(0, self.requests - connections),
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"{stats['requests']} requests over {stats['connections_opened']} connections "
+                f"({stats['connections_reused']} reused{', HTTP/2 enabled' if self.http2 else ''})")
+
+    def close(self):
+        self.session.close()
+
+_shared_client = None
+
+def configure_client(pool_size=DEFAULT_POOL_SIZE, http2=False):
+    """
+    Replace the shared client, e.g. from a scraper's command-line options.
+    """
+    global _shared_client
+    if _shared_client is not None:
+        _shared_client.close()
+    _shared_client = HttpClient(pool_size, http2)
+    return _shared_client
+
+def get_client():
+    """
+    Return the shared client, creating it with default settings on first use.
+    """
+    if _shared_client is None:
+        configure_client()
+    return _shared_client
+
+# Trace hooks that collect the same stats for an aiohttp.ClientSession
+class AiohttpConnectionStats:
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def trace_config(self):
+        # Imported here so the sync scrapers don't need aiohttp installed
+        import aiohttp
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return trace_config
+
+    async def _on_request_start(self, session, context, params):
+        self.requests += 1
+
+    async def _on_connection_create_end(self, session, context, params):
+        self.new_connections += 1
+
+    async def _on_connection_reuseconn(self, session, context, params):
+        self.reused_connections += 1
+
+    def summary(self):
+        return (f"{self.requests} requests over {self.new_connections} connections "
+                f"({self.reused_connections} reused)")
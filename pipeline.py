@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+from rate_limit import HostRateLimiter
+from http_cache import ResponseCache, DEFAULT_CACHE_DIR, DEFAULT_TTL, DEFAULT_NEWS_TTL, DEFAULT_MAX_BYTES
+from company_records import JsonlWriter, DEFAULT_JSONL_FILE
+from company_store import CompanyStore, StoreWriter, DEFAULT_DB_FILE
+from http_client import configure_client, AiohttpConnectionStats
+from discover_companies import (iter_company_slugs, COMPANY_URL_PREFIX,
+                                DEFAULT_BATCHES, DEFAULT_INDUSTRIES, DEFAULT_REGIONS)
+from scrape_yc_companies import fetch_text_async, parse_company_page, enrich_news_async
+
+# End-to-end streaming pipeline: discover -> fetch -> parse -> enrich -> sink.
+#
+# Every stage runs at the same time, with its own number of workers, and hands
+# its output to the next stage through a bounded queue. A stage that falls behind
+# fills its input queue, which blocks the stage before it (backpressure), so
+# memory stays bounded and the run takes about as long as the slowest stage
+# instead of the sum of all of them. Companies are written as soon as they are
+# finished, so the first rows show up within seconds of starting.
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; DataExtractionBot/1.0)"
+}
+
+# Passed down a queue once per consumer worker when its producers are done
+DONE = object()
+
+class StageStats:
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+
+    def record(self, started):
+        self.items += 1
+        self.busy += time.perf_counter() - started
+
+    def summary(self, elapsed):
+        # Utilization near 100% marks the stage that sets the pace
+        utilization = self.busy / (elapsed * self.workers) * 100 if elapsed else 0
+        return f"{self.name:<9} {self.workers:>3} workers {self.items:>7} items {utilization:6.1f}% busy"
+
+class Pipeline:
+    def __init__(self, writer, fetch_workers=8, parse_workers=2, news_workers=8, queue_size=None,
+                 rate=2.0, burst=None, cache=None, news_cache=None, fetch_news=True):
+        self.writer = writer
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        # Without news workers nothing would drain the news queue
+        self.fetch_news = fetch_news and news_workers > 0
+        self.news_workers = news_workers if self.fetch_news else 0
+        self.queue_size = queue_size
+        self.limiter = HostRateLimiter(rate, burst)
+        self.cache = cache
+        self.news_cache = news_cache
+        self.stats = {
+            name: StageStats(name, workers) for name, workers in (
+                ('discover', 1), ('fetch', fetch_workers), ('parse', parse_workers),
+                ('enrich', self.news_workers), ('sink', 1),
+            )
+        }
+        self.first_row_at = None
+        self.failed = 0
+
+    def _queue(self, consumers):
+        # Room for a couple of items per consumer worker unless --queue-size says otherwise
+        return asyncio.Queue(maxsize=self.queue_size or consumers * 2)
+
+    async def run(self, urls):
+        """
+        Run every stage until 'urls' (any iterable, e.g. a discovery generator)
+        is exhausted and the last company is written.
+        """
+        self.started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        fetch_queue = self._queue(self.fetch_workers)
+        parse_queue = self._queue(self.parse_workers)
+        news_queue = self._queue(max(1, self.news_workers))
+        sink_queue = self._queue(1)
+        parse_pool = ThreadPoolExecutor(max_workers=self.parse_workers)
+
+        connector = aiohttp.TCPConnector(limit=self.fetch_workers + self.news_workers, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=60)
+        self.connection_stats = AiohttpConnectionStats()
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         trace_configs=[self.connection_stats.trace_config()]) as session:
+
+            discover_done = loop.create_future()
+
+            def discover():
+                # Runs in a thread so a blocking generator (discovery paging) feeds the loop
+                stats = self.stats['discover']
+                try:
+                    url_iter = iter(urls)
+                    while True:
+                        started = time.perf_counter()
+                        url = next(url_iter, None)
+                        if url is None:
+                            break
+                        stats.record(started)
+                        # Blocks while the fetch queue is full
+                        asyncio.run_coroutine_threadsafe(fetch_queue.put(url), loop).result()
+                except Exception as e:
+                    loop.call_soon_threadsafe(discover_done.set_exception, e)
+                else:
+                    loop.call_soon_threadsafe(discover_done.set_result, None)
+
+            async def fetch_worker():
+                stats = self.stats['fetch']
+                while True:
+                    url = await fetch_queue.get()
+                    if url is DONE:
+                        break
+                    started = time.perf_counter()
+                    try:
+                        status, html_content = await fetch_text_async(session, url, HEADERS, self.limiter, self.cache)
+                    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+                        # One bad URL is counted and skipped, it doesn't stop the run
+                        print(f"Failed to load company page {url} ({e!r})")
+                        self.failed += 1
+                        continue
+                    stats.record(started)
+                    if status != 200:
+                        print(f"Failed to load company page {url} (Status code: {status})")
+                        self.failed += 1
+                        continue
+                    await parse_queue.put((url, html_content))
+
+            async def parse_worker():
+                stats = self.stats['parse']
+                while True:
+                    item = await parse_queue.get()
+                    if item is DONE:
+                        break
+                    started = time.perf_counter()
+                    url, html_content = item
+                    try:
+                        company_info, news_url = await loop.run_in_executor(parse_pool, parse_company_page, html_content, url)
+                    except Exception as e:
+                        print(f"Failed to parse company page {url} ({e!r})")
+                        company_info = news_url = None
+                    stats.record(started)
+                    if company_info is None:
+                        self.failed += 1
+                    elif news_url and self.fetch_news:
+                        await news_queue.put((url, company_info, news_url))
+                    else:
+                        await sink_queue.put(company_info)
+
+            async def news_worker():
+                stats = self.stats['enrich']
+                while True:
+                    item = await news_queue.get()
+                    if item is DONE:
+                        break
+                    started = time.perf_counter()
+                    url, company_info, news_url = item
+                    try:
+                        await enrich_news_async(session, company_info, url, news_url, HEADERS, self.limiter, self.news_cache)
+                    except Exception as e:
+                        # The company is still written, with the news embedded in its page
+                        print(f"Failed to merge news for {url} ({e!r})")
+                    stats.record(started)
+                    await sink_queue.put(company_info)
+
+            async def sink_worker():
+                stats = self.stats['sink']
+                while True:
+                    company_info = await sink_queue.get()
+                    if company_info is DONE:
+                        break
+                    started = time.perf_counter()
+                    self.writer.write(company_info)
+                    if self.first_row_at is None:
+                        self.first_row_at = time.perf_counter() - self.started
+                        print(f"First company written after {self.first_row_at:.1f}s.")
+                    stats.record(started)
+
+            async def close_after(tasks, queue, consumers):
+                # When every producer of a queue is done, tell each of its consumers
+                await asyncio.gather(*tasks)
+                for _ in range(consumers):
+                    await queue.put(DONE)
+
+            # A daemon thread, so an interrupted run doesn't wait on a blocked discovery
+            threading.Thread(target=discover, daemon=True).start()
+            fetch_tasks = [asyncio.ensure_future(fetch_worker()) for _ in range(self.fetch_workers)]
+            parse_tasks = [asyncio.ensure_future(parse_worker()) for _ in range(self.parse_workers)]
+            news_tasks = [asyncio.ensure_future(news_worker()) for _ in range(self.news_workers)]
+            sink_task = asyncio.ensure_future(sink_worker())
+            try:
+                await asyncio.gather(
+                    close_after([discover_done], fetch_queue, self.fetch_workers),
+                    close_after(fetch_tasks, parse_queue, self.parse_workers),
+                    close_after(parse_tasks, news_queue, self.news_workers),
+                    close_after(parse_tasks + news_tasks, sink_queue, 1),
+                    sink_task,
+                )
+            finally:
+                parse_pool.shutdown(wait=False)
+
+        self.elapsed = time.perf_counter() - self.started
+
+    def summary(self):
+        lines = [stats.summary(self.elapsed) for stats in self.stats.values() if stats.workers]
+        lines.append(f"Connections: {self.connection_stats.summary()}")
+        return '\n'.join(lines)
+
+def read_urls_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def discovered_urls(batches, industries, regions, workers):
+    for slug in iter_company_slugs(batches, industries, regions, workers):
+        yield COMPANY_URL_PREFIX + slug
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Discover, fetch, parse, enrich and store YC companies in one streaming run")
+    parser.add_argument("--urls-file", help="Read company URLs from this JSON file (e.g. filtered_company_urls.json) "
+                                            "instead of discovering them")
+    parser.add_argument("--batch", action="append", help="Discovery batch filter, repeatable")
+    parser.add_argument("--industry", action="append", help="Discovery industry filter, repeatable")
+    parser.add_argument("--region", action="append", help="Discovery region filter, repeatable")
+    parser.add_argument("--all", action="store_true", help="Discover the whole directory instead of the default filters")
+    parser.add_argument("--discover-workers", type=int, default=4, help="Directory pages fetched at once (default: 4)")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="Company pages in flight (default: 8)")
+    parser.add_argument("--parse-workers", type=int, default=2, help="Threads parsing company pages (default: 2)")
+    parser.add_argument("--news-workers", type=int, default=8, help="newsUrl fetches in flight, 0 skips newsUrl like --skip-news (default: 8)")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="Capacity of each stage queue (default: twice the consuming stage's workers)")
+    parser.add_argument("--rate", type=float, default=2.0, help="Requests per second allowed per host (default: 2.0)")
+    parser.add_argument("--burst", type=float, default=None, help="Token bucket size per host (default: same as --rate)")
+    parser.add_argument("--skip-news", action="store_true", help="Don't fetch newsUrl")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Directory of the on-disk response cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always download pages, bypassing the response cache")
+    parser.add_argument("--format", choices=["jsonl", "sqlite"], default="jsonl",
+                        help="jsonl appends each company as it is finished; sqlite upserts it by slug")
+    parser.add_argument("--output", default=None,
+                        help=f"Output file (default: {DEFAULT_JSONL_FILE}, or {DEFAULT_DB_FILE} with --format sqlite)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    if args.urls_file:
+        urls = read_urls_file(args.urls_file)
+    else:
+        defaults = not args.all
+        urls = discovered_urls(
+            args.batch or (DEFAULT_BATCHES if defaults else []),
+            args.industry or (DEFAULT_INDUSTRIES if defaults else []),
+            args.region or (DEFAULT_REGIONS if defaults else []),
+            args.discover_workers,
+        )
+        # Discovery calls go through the shared keep-alive client
+        configure_client(pool_size=args.discover_workers)
+
+    cache = None
+    news_cache = None
+    if not args.no_cache:
+        cache = ResponseCache(args.cache_dir, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES)
+        if not args.skip_news:
+            news_cache = ResponseCache(os.path.join(args.cache_dir, 'news'), ttl=DEFAULT_NEWS_TTL, max_bytes=DEFAULT_MAX_BYTES)
+
+    if args.format == "sqlite":
+        output_file = args.output or DEFAULT_DB_FILE
+        writer = StoreWriter(CompanyStore(output_file))
+    else:
+        output_file = args.output or DEFAULT_JSONL_FILE
+        writer = JsonlWriter(output_file)
+
+    pipeline = Pipeline(writer, args.fetch_workers, args.parse_workers, args.news_workers, args.queue_size,
+                        args.rate, args.burst, cache, news_cache, fetch_news=not args.skip_news)
+    try:
+        asyncio.run(pipeline.run(urls))
+    except KeyboardInterrupt:
+        print(f"Interrupted. Companies finished so far are in '{output_file}'.")
+    finally:
+        writer.close()
+        for name, response_cache in (('Response cache', cache), ('News cache', news_cache)):
+            if response_cache:
+                print(f"{name}: {response_cache.summary()}")
+                response_cache.close()
+
+    if hasattr(pipeline, 'elapsed'):
+        print(pipeline.summary())
+        print(f"Pipeline complete. {writer.count} companies written to '{output_file}' "
+              f"in {pipeline.elapsed:.1f}s ({pipeline.failed} failed).")
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,24 @@
-import requests
-from bs4 import BeautifulSoup
 import json
-import html
 import time
 from tqdm import tqdm
 import os
+import argparse
+import asyncio
+import aiohttp
+from rate_limit import HostRateLimiter
+from data_page import extract_data_page
+from http_cache import ResponseCache, DEFAULT_CACHE_DIR, DEFAULT_TTL, DEFAULT_NEWS_TTL, DEFAULT_MAX_BYTES
+from crawl_journal import CrawlJournal, DEFAULT_JOURNAL_FILE
+from company_records import JsonlWriter, DEFAULT_JSONL_FILE
+from company_store import CompanyStore, StoreWriter, DEFAULT_DB_FILE
+from http_client import get_client, configure_client, AiohttpConnectionStats, DEFAULT_POOL_SIZE
 
-# Function to extract company data from a single company URL
-def extract_company_data(company_url, headers):
-    response = requests.get(company_url, headers=headers)
-    
-    if response.status_code != 200:
-        print(f"Failed to load company page {company_url} (Status code: {response.status_code})")
-        return None
-    
-    html_content = response.text
-    soup = BeautifulSoup(html_content, "html.parser")
-    
-    # Extract the data-page div
-    data_page_div = soup.find('div', attrs={'data-page': True})
-    if not data_page_div:
-        print(f"Couldn't find the data-page div in the company page: {company_url}")
-        return None
-    
-    # The data-page attribute contains HTML-encoded JSON
-    data_page_json_str = data_page_div['data-page']
-    # Unescape HTML entities
-    data_page_json_str = html.unescape(data_page_json_str)
-    
-    # Parse the JSON string
-    try:
-        data_page = json.loads(data_page_json_str)
-    except json.JSONDecodeError as e:
-        print(f"JSON decoding failed for {company_url}: {e}")
-        return None
-    
+# Function to build the structured company record from a parsed data-page payload
+def build_company_info(data_page):
     # Structure the data
     company_info = {
         "name": data_page.get("props", {}).get("company", {}).get("name"),
+        "slug": data_page.get("props", {}).get("company", {}).get("slug"),
         "one_liner": data_page.get("props", {}).get("company", {}).get("one_liner"),
         "website": data_page.get("props", {}).get("company", {}).get("website"),
         "long_description": data_page.get("props", {}).get("company", {}).get("long_description"),
@@ -87,62 +68,223 @@ def extract_company_data(company_url, headers):
         }
         company_info["latest_news"].append(news_item)
     
-    # Fetch Latest News from newsUrl if available
+    return company_info
+
+# Function to parse a company page into (company_info, news_url)
+def parse_company_page(html_content, company_url):
+    # Extract and decode the data-page JSON without building a full tree
+    try:
+        data_page = extract_data_page(html_content)
+    except json.JSONDecodeError as e:
+        print(f"JSON decoding failed for {company_url}: {e}")
+        return None, None
+    if data_page is None:
+        print(f"Couldn't find the data-page div in the company page: {company_url}")
+        return None, None
+    
+    company_info = build_company_info(data_page)
+    
+    # Latest News from newsUrl is fetched separately by the caller
     news_url = data_page.get("props", {}).get("company", {}).get("newsUrl")
     if news_url:
         # Complete the news_url if it's relative
         if news_url.startswith("/"):
             news_url = "https://www.ycombinator.com" + news_url
-        news_response = requests.get(news_url, headers=headers)
-        if news_response.status_code == 200:
-            try:
-                # Assuming the response is JSON
-                additional_news_data = news_response.json()
-                # Check if 'newsItems' exists
-                if 'newsItems' in additional_news_data:
-                    for news in additional_news_data['newsItems']:
-                        # Avoid duplicates
-                        if news.get("url") not in [item['url'] for item in company_info["latest_news"]]:
-                            news_item = {
-                                "title": news.get("title"),
-                                "url": news.get("url"),
-                                "date": news.get("date")
-                            }
-                            company_info["latest_news"].append(news_item)
-                else:
-                    print(f"No 'newsItems' found in newsUrl response for {company_url}")
-            except json.JSONDecodeError:
-                print(f"Failed to decode JSON from newsUrl response for {company_url}")
-        else:
-            print(f"Failed to fetch news from {news_url} (Status code: {news_response.status_code})")
+    
+    return company_info, news_url
+
+# Function to merge the newsUrl JSON response into company_info['latest_news']
+def merge_news_items(company_info, additional_news_data, company_url):
+    # Check if 'newsItems' exists
+    if 'newsItems' in additional_news_data:
+        # Set of URLs already present, so each incoming item is checked in O(1)
+        seen_urls = {item['url'] for item in company_info["latest_news"]}
+        for news in additional_news_data['newsItems']:
+            # Avoid duplicates
+            if news.get("url") not in seen_urls:
+                news_item = {
+                    "title": news.get("title"),
+                    "url": news.get("url"),
+                    "date": news.get("date")
+                }
+                company_info["latest_news"].append(news_item)
+                seen_urls.add(news_item["url"])
+    else:
+        print(f"No 'newsItems' found in newsUrl response for {company_url}")
+
+# Function to merge a fetched newsUrl response, reporting failures the same way for both modes
+def handle_news_response(company_info, company_url, news_url, news_status, news_body):
+    if news_status == 200:
+        try:
+            # Assuming the response is JSON
+            merge_news_items(company_info, json.loads(news_body), company_url)
+        except json.JSONDecodeError:
+            print(f"Failed to decode JSON from newsUrl response for {company_url}")
+    else:
+        print(f"Failed to fetch news from {news_url} (Status code: {news_status})")
+
+# Function to GET a URL through the optional response cache; returns (status, text)
+def fetch_text(url, headers, cache=None):
+    client = get_client()
+    if cache is None:
+        response = client.get(url, headers=headers)
+        return response.status_code, response.text
+    
+    body = cache.fresh_body(url)
+    if body is not None:
+        return 200, body
+    
+    response = client.get(url, headers={**headers, **cache.conditional_headers(url)})
+    return cache.handle_response(url, response.status_code, response.text, response.headers)
+
+# Function to extract company data from a single company URL.
+# newsUrl responses use their own cache (news changes more often than company
+# pages), and fetch_news=False skips the newsUrl request entirely.
+def extract_company_data(company_url, headers, cache=None, news_cache=None, fetch_news=True):
+    status, html_content = fetch_text(company_url, headers, cache)
+    
+    if status != 200:
+        print(f"Failed to load company page {company_url} (Status code: {status})")
+        return None
+    
+    company_info, news_url = parse_company_page(html_content, company_url)
+    if company_info is None:
+        return None
+    
+    # Fetch Latest News from newsUrl if available
+    if news_url and fetch_news:
+        news_status, news_body = fetch_text(news_url, headers, news_cache)
+        handle_news_response(company_info, company_url, news_url, news_status, news_body)
     
     return company_info
 
+# Async version of fetch_text. Cache hits within the TTL skip the network, so they
+# don't take a rate limiter token.
+async def fetch_text_async(session, url, headers, limiter, cache=None):
+    request_headers = headers
+    if cache is not None:
+        body = cache.fresh_body(url)
+        if body is not None:
+            return 200, body
+        request_headers = {**headers, **cache.conditional_headers(url)}
+    
+    await limiter.acquire_async(url)
+    async with session.get(url, headers=request_headers) as response:
+        status = response.status
+        text = await response.text()
+        response_headers = response.headers
+    
+    if cache is None:
+        return status, text
+    return cache.handle_response(url, status, text, response_headers)
+
+# Async page stage: fetch and parse one company page; returns (company_info, news_url)
+async def fetch_company_page_async(session, company_url, headers, limiter, cache=None):
+    try:
+        status, html_content = await fetch_text_async(session, company_url, headers, limiter, cache)
+    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+        # Counted as a failed URL, like a non-200 response
+        print(f"Failed to load company page {company_url} ({e!r})")
+        return None, None
+    
+    if status != 200:
+        print(f"Failed to load company page {company_url} (Status code: {status})")
+        return None, None
+    
+    try:
+        return parse_company_page(html_content, company_url)
+    except Exception as e:
+        # A malformed page fails its URL, not the whole crawl
+        print(f"Failed to parse company page {company_url} ({e!r})")
+        return None, None
+
+# Async news stage: fetch newsUrl and merge it into company_info
+async def enrich_news_async(session, company_info, company_url, news_url, headers, limiter, news_cache=None):
+    try:
+        news_status, news_body = await fetch_text_async(session, news_url, headers, limiter, news_cache)
+    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+        # The company keeps the news embedded in its page
+        print(f"Failed to fetch news from {news_url} ({e!r})")
+        return
+    handle_news_response(company_info, company_url, news_url, news_status, news_body)
+
+# Fetch all company URLs concurrently; results keep the order of company_urls.
+#
+# Page fetching and news enrichment are separate stages connected by a bounded
+# queue: 'concurrency' page workers hand each parsed company with a newsUrl to
+# 'news_concurrency' news workers and move straight on to the next page. Both
+# stages share the per-host rate limiter, so the crawl is paced by the politeness
+# budget rather than by round trips.
+async def crawl_companies_async(company_urls, headers, concurrency, rate, burst=None, cache=None, on_result=None,
+                                news_cache=None, news_concurrency=None, fetch_news=True):
+    limiter = HostRateLimiter(rate, burst)
+    news_concurrency = news_concurrency or concurrency
+    # Keep-alive connection pool shared by all workers
+    connector = aiohttp.TCPConnector(limit=concurrency + news_concurrency, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=60)
+    connection_stats = AiohttpConnectionStats()
+    results = [None] * len(company_urls)
+    
+    page_queue = asyncio.Queue()
+    for item in enumerate(company_urls):
+        page_queue.put_nowait(item)
+    news_queue = asyncio.Queue(maxsize=news_concurrency * 2)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     trace_configs=[connection_stats.trace_config()]) as session:
+        with tqdm(total=len(company_urls), desc="Processing Companies") as progress:
+            def finish(index, company_url, company_info):
+                results[index] = company_info
+                if on_result and company_info:
+                    on_result(company_url, company_info)
+                progress.update(1)
+            
+            async def page_worker():
+                while not page_queue.empty():
+                    index, company_url = page_queue.get_nowait()
+                    company_info, news_url = await fetch_company_page_async(session, company_url, headers, limiter, cache)
+                    if company_info and news_url and fetch_news:
+                        # Blocks only when the news stage is news_concurrency * 2 companies behind
+                        await news_queue.put((index, company_url, company_info, news_url))
+                    else:
+                        finish(index, company_url, company_info)
+            
+            async def news_worker():
+                while True:
+                    index, company_url, company_info, news_url = await news_queue.get()
+                    try:
+                        await enrich_news_async(session, company_info, company_url, news_url, headers, limiter, news_cache)
+                    except Exception as e:
+                        # Keep the worker alive; the company is still recorded below
+                        print(f"Failed to merge news for {company_url} ({e!r})")
+                    finally:
+                        finish(index, company_url, company_info)
+                        news_queue.task_done()
+            
+            news_workers = [asyncio.ensure_future(news_worker()) for _ in range(news_concurrency)]
+            await asyncio.gather(*(page_worker() for _ in range(concurrency)))
+            await news_queue.join()
+            for task in news_workers:
+                task.cancel()
+            await asyncio.gather(*news_workers, return_exceptions=True)
+    
+    print(f"Connections: {connection_stats.summary()}")
+    return [company for company in results if company]
+
 # Function to extract all company URLs from the companies directory page
 def get_all_company_urls(directory_url, headers, max_companies=None):
-    response = requests.get(directory_url, headers=headers)
+    response = get_client().get(directory_url, headers=headers)
     
     if response.status_code != 200:
         raise Exception(f"Failed to load directory page {directory_url} (Status code: {response.status_code})")
     
-    html_content = response.text
-    soup = BeautifulSoup(html_content, "html.parser")
-    
-    # Extract the data-page div
-    data_page_div = soup.find('div', attrs={'data-page': True})
-    if not data_page_div:
-        raise Exception("Couldn't find the data-page div in the directory page.")
-    
-    # The data-page attribute contains HTML-encoded JSON
-    data_page_json_str = data_page_div['data-page']
-    # Unescape HTML entities
-    data_page_json_str = html.unescape(data_page_json_str)
-    
-    # Parse the JSON string
+    # Extract and decode the data-page JSON without building a full tree
     try:
-        data_page = json.loads(data_page_json_str)
+        data_page = extract_data_page(response.text)
     except json.JSONDecodeError as e:
         raise Exception(f"JSON decoding failed for directory page: {e}")
+    if data_page is None:
+        raise Exception("Couldn't find the data-page div in the directory page.")
     
     # Extract companies list
     companies = data_page.get("props", {}).get("companies", {}).get("list", [])
@@ -162,7 +304,49 @@ def get_all_company_urls(directory_url, headers, max_companies=None):
     
     return company_urls
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape YC company pages listed in filtered_company_urls.json")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Fetch companies concurrently with asyncio instead of one at a time")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Number of companies fetched at the same time in --async mode (default: 8)")
+    parser.add_argument("--rate", type=float, default=2.0,
+                        help="Requests per second allowed per host in --async mode (default: 2.0)")
+    parser.add_argument("--burst", type=float, default=None,
+                        help="Token bucket size per host in --async mode (default: same as --rate)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Directory of the on-disk response cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL,
+                        help="Seconds a cached response is used without revalidation (default: one day)")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Evict least recently used responses above this size (default: 512)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always download pages, bypassing the response cache")
+    parser.add_argument("--news-cache-ttl", type=float, default=DEFAULT_NEWS_TTL,
+                        help="Seconds a cached newsUrl response is used without revalidation (default: six hours)")
+    parser.add_argument("--news-concurrency", type=int, default=None,
+                        help="Number of newsUrl fetches in flight in --async mode (default: same as --concurrency)")
+    parser.add_argument("--skip-news", action="store_true",
+                        help="Don't fetch newsUrl; keep only the news embedded in the company page")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL_FILE,
+                        help=f"Checkpoint journal of finished companies (default: {DEFAULT_JOURNAL_FILE})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip companies already recorded in the journal by an interrupted run")
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                        help=f"Keep-alive connections per host in the sync mode (default: {DEFAULT_POOL_SIZE})")
+    parser.add_argument("--http2", action="store_true",
+                        help="Use HTTP/2 (httpx) in the sync mode; the --async mode always uses HTTP/1.1 keep-alive")
+    parser.add_argument("--format", choices=["json", "jsonl", "sqlite"], default="json",
+                        help="json merges into one JSON array at the end; jsonl appends each company as it is scraped; "
+                             "sqlite upserts companies by slug into the SQLite store")
+    parser.add_argument("--output", default=None,
+                        help=f"Output file (default: yc_companies_data.json, {DEFAULT_JSONL_FILE} with --format jsonl, "
+                             f"{DEFAULT_DB_FILE} with --format sqlite)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     # Directory URL
     directory_url = "https://www.ycombinator.com/companies"
     
@@ -185,21 +369,97 @@ def main():
             return
     
     print(f"Found {len(company_urls)} company URLs.")
+    
+    # Shared keep-alive client for the sync mode
+    client = configure_client(args.pool_size, args.http2)
+    
+    # On-disk response cache, so re-runs mostly cost 304s and local reads
+    # newsUrl responses live in their own cache with a shorter TTL
+    cache = None
+    news_cache = None
+    if not args.no_cache:
+        max_bytes = int(args.cache_max_mb * 1024 * 1024)
+        cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl, max_bytes=max_bytes)
+        if not args.skip_news:
+            news_cache = ResponseCache(os.path.join(args.cache_dir, 'news'), ttl=args.news_cache_ttl, max_bytes=max_bytes)
 
-    # List to hold all company data
-    all_companies_data = []
+    # Every finished company goes to the journal as soon as it completes
+    journal = CrawlJournal(args.journal)
+    pending_urls = company_urls
+    if args.resume:
+        completed = journal.load()
+        pending_urls = [url for url in company_urls if url not in completed]
+        print(f"Resuming: {len(company_urls) - len(pending_urls)} companies already in '{args.journal}'.")
+    journal.open(resume=args.resume)
     
-    # Iterate through each company URL and extract data
-    for company_url in tqdm(company_urls, desc="Processing Companies"):
-        company_data = extract_company_data(company_url, headers)
-        if company_data:
-            all_companies_data.append(company_data)
-        # Be polite and avoid hammering the server
-        time.sleep(1)  # Adjust delay as needed
+    # In jsonl and sqlite mode companies are written to the output as they are produced
+    default_outputs = {"json": 'yc_companies_data.json', "jsonl": DEFAULT_JSONL_FILE, "sqlite": DEFAULT_DB_FILE}
+    output_file = args.output or default_outputs[args.format]
+    writer = None
+    if args.format == "jsonl":
+        writer = JsonlWriter(output_file)
+    elif args.format == "sqlite":
+        writer = StoreWriter(CompanyStore(output_file))
+        if args.resume and completed:
+            # Journaled companies may still have been in the store's write buffer when
+            # the last run died; upserting them again is idempotent
+            restored = writer.store.upsert_companies(completed.values())
+            print(f"Re-upserted {restored} journaled companies into '{output_file}'.")
     
-    # Save all data to a single JSON file
-    output_file = 'yc_companies_data.json'  # Final output file
+    def record_company(company_url, company_data):
+        # Output first: the journal marks a company as done for --resume
+        if writer:
+            writer.write(company_data)
+        journal.record(company_url, company_data)
     
+    try:
+        if args.use_async:
+            # Concurrent fetch, paced by the per-host token bucket instead of a global sleep
+            asyncio.run(
+                crawl_companies_async(pending_urls, headers, args.concurrency, args.rate, args.burst, cache, record_company,
+                                      news_cache, args.news_concurrency, not args.skip_news)
+            )
+        else:
+            # Iterate through each company URL and extract data
+            for company_url in tqdm(pending_urls, desc="Processing Companies"):
+                network_before = (cache.network_requests if cache else 0) + (news_cache.network_requests if news_cache else 0)
+                company_data = extract_company_data(company_url, headers, cache, news_cache, not args.skip_news)
+                if company_data:
+                    record_company(company_url, company_data)
+                # Be polite and avoid hammering the server (not needed when served from the cache)
+                network_after = (cache.network_requests if cache else 0) + (news_cache.network_requests if news_cache else 0)
+                if cache is None or network_after > network_before:
+                    time.sleep(1)  # Adjust delay as needed
+    except KeyboardInterrupt:
+        print(f"Interrupted. Finished companies are saved in '{args.journal}'; rerun with --resume to continue.")
+        return
+    finally:
+        journal.close()
+        if writer:
+            writer.close()
+        if cache:
+            print(f"Response cache: {cache.summary()}")
+            cache.close()
+        if news_cache:
+            print(f"News cache: {news_cache.summary()}")
+            news_cache.close()
+        if not args.use_async:
+            print(f"Connections: {client.summary()}")
+        client.close()
+    
+    if args.format == "jsonl":
+        print(f"Data extraction complete. Appended {writer.count} companies to '{output_file}'.")
+        print(f"Run 'python company_records.py compact {output_file}' to remove duplicates from earlier runs.")
+        return
+    if args.format == "sqlite":
+        print(f"Data extraction complete. Upserted {writer.count} companies into '{output_file}'.")
+        return
+    
+    # List to hold all company data, in the order of the URL list
+    completed = journal.load()
+    all_companies_data = [completed[url] for url in company_urls if url in completed]
+    
+    # Save all data to a single JSON file
     # Check if the file exists to avoid overwriting
     if os.path.exists(output_file):
         # Optionally, append to the existing file or handle duplicates based on 'website'